@@ -12,6 +12,13 @@ on a given set of points in ℝ². The procedure is:
 6. Record new leading terms and iterate by increasing degree.
 7. Collect and print a reduced generating set of the vanishing ideal.
 
+The computation itself lives in vanishing.py.  By default it runs a
+Buchberger–Möller engine that performs steps 2–6 in a single pass over
+the monomials; pass backend="sympy" to `nullspace_polynomials` for the
+original per-degree null-space procedure.  The engine works on exponent
+arrays in any number of variables and has no import-time configuration;
+this script only fixes the symbols and the sample points.
+
 Usage:
     Adjust `points` and `max_degree` as needed. Run the script directly
     to view generators degree‑by‑degree. Optionally, compute a Gröbner basis
@@ -23,18 +30,10 @@ Encadrant: Jérémy Berthomieu
 
 import sympy as sp 
 
-import re
-
 import random
-import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
 
-_EXP_RE = re.compile(r"\*\*([0-9]+)")
-
-def to_caret(expr):
-    """Convert a SymPy expression to a string with caret notation."""
-    return _EXP_RE.sub(r"^\1", str(expr))
+import vanishing
 
 # ---------------------------------------------------------------------
 # Configuration
@@ -55,50 +54,22 @@ points = [(0, 0), (1, 0),(2,0),(0,1)]
 # ---------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------
-def monomials_up_to_degree(deg: int):
+def nullspace_polynomials(pts, max_degree=None, backend="bm", order="grlex", **options):
     """
-    Return the list of monomials x**i * y**j with i + j ≤ deg
-    ordered graded‑lex (total degree first, then x‑exponent descending).
+    Yield (degree, monos, [poly₁, …, poly_k]) for the points `pts`
+    using the shared engine in vanishing.py (see its docstring).
+    The stream stops by itself once the staircase closes.
     """
-    monos = []
-    for total in range(deg + 1):
-        for i in range(total + 1):
-            j = total - i
-            monos.append(x ** i * y ** j)
-    return monos
-
-def divides(m1, m2):
-    """Return True if monomial m2 is divisible by m1."""
-    pd1 = m1.as_powers_dict()
-    pd2 = m2.as_powers_dict()
-    return all(pd2.get(sym, 0) >= exp for sym, exp in pd1.items())
-
-def nullspace_polynomials(pts, max_degree=4):
+    return vanishing.nullspace_polynomials(pts, (x, y), max_degree, backend, order, **options)
+
+def vanishing_ideal(pts, max_degree=None, backend="bm", order="grlex", **options):
     """
-    Yield (degree, monos, [poly₁, …, poly_k]) where monos is
-    the filtered list of standard monomials of degree ≤ d,
-    and the list is a SymPy basis of the null‑space of
-    the evaluation matrix for those monomials.
+    Compute the vanishing ideal of `pts` once and return the
+    vanishing.VanishingIdeal result (generators, staircase, timings).
+    `options` go to the backend, e.g. workers=8 with backend="numeric"
+    to build the evaluation matrices in 8 processes.
     """
-    lead_terms = []
-    for d in range(max_degree + 1):
-        monos = monomials_up_to_degree(d)
-        # filter out monomials divisible by any leading term
-        monos_filt = [
-            m for m in monos
-            if not any(hasattr(lt, "as_powers_dict") and divides(lt, m) for lt in lead_terms)
-        ]
-        # build evaluation matrix
-        M = sp.Matrix([[m.subs({x: xi, y: yi}) for m in monos_filt] for xi, yi in pts])
-        ker = M.nullspace()
-        polys = [sp.factor(sum(c * m for c, m in zip(vec, monos_filt))) for vec in ker]
-        # record leading terms for filtering next degrees
-        for p in polys:
-            poly_obj = sp.Poly(p, x, y)
-            exp_tuple = poly_obj.monoms()[0]
-            lt = x**exp_tuple[0] * y**exp_tuple[1]
-            lead_terms.append(lt)
-        yield d, monos_filt, polys
+    return vanishing.vanishing_ideal(pts, (x, y), max_degree, backend, order, **options)
 
 
 
@@ -106,50 +77,10 @@ def nullspace_polynomials(pts, max_degree=4):
 # ---------------------------------------------------------------------
 # Command‑line interface
 def main():
+    ideal = vanishing_ideal(points)
     print(f"Points E: {points}")
-    print("Vanishing polynomials degree‑by‑degree:\n")
-    for d, monos, polys in nullspace_polynomials(points, max_degree=len(points)):
-        if polys:
-            monos_str = ",".join(to_caret(m) for m in monos)
-            print(f"Degree ≤ {d}   monomials = {{{monos_str}}}   nullspace dim = {len(polys)}")
-            for p in polys:
-                print("   ", to_caret(p))
-            print()
-
-    # Collect a reduced generating set from nullspace_polynomials
-    gens = []
-    for _, _, polys in nullspace_polynomials(points, max_degree=len(points)):
-        gens.extend(polys)
-    print("-" * 60)
-    print("Reduced basis of the vanishing ideal:")
-    for p in gens:
-        print("   ", to_caret(p))
-
-    # Plot points and reduced basis polynomials
-    plt.figure()
-    xs = [pt[0] for pt in points]
-    ys = [pt[1] for pt in points]
-    scatter_handle = plt.scatter(xs, ys, color='black')
-    handles = [scatter_handle]
-    labels = ['Points']
-    # Define plotting grid
-    x_min, x_max = min(xs) - 1, max(xs) + 1
-    y_min, y_max = min(ys) - 1, max(ys) + 1
-    xx, yy = np.meshgrid(np.linspace(x_min, x_max, 400), np.linspace(y_min, y_max, 400))
-    # Draw zero-contour for each generator in the reduced basis
-    for idx, p in enumerate(gens, 1):
-        f = sp.lambdify((x, y), p, 'numpy')
-        zz = f(xx, yy)
-        # Plot zero contour with unique color and label
-        CS = plt.contour(xx, yy, zz, levels=[0], colors=[f'C{idx}'], linewidths=2)
-        # Use a proxy line for the contour in the legend
-        handle = Line2D([0], [0], color=f'C{idx}', linewidth=2)
-        handles.append(handle)
-        labels.append(to_caret(p))
-    plt.legend(handles=handles, labels=labels, loc='best')
-    plt.title("Reduced basis vanishing curves")
-    plt.xlabel('x')
-    plt.ylabel('y')
+    print(ideal.report())
+    ideal.plot()
     plt.show()
 
 
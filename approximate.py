@@ -0,0 +1,121 @@
+"""Approximate vanishing ideals of noisy point sets.
+
+Measured points never lie exactly on a curve, so the exact and numeric
+backends only find the polynomials that interpolate them.  This module
+implements the Approximate Buchberger–Möller algorithm (ABM): a
+polynomial g with coefficient vector c is treated as vanishing when its
+root-mean-square value on the n points, relative to the size of c,
+
+    ‖g(X)‖₂ / (√n · ‖c‖₂),
+
+is at most ``eps``.  Dividing by ‖c‖ rather than making g monic matters:
+a monic polynomial of high degree is small on [−1, 1]ⁿ whatever the
+points, while one of unit coefficient norm is not.
+
+Candidates are processed degree by degree in increasing graded term order,
+like the other per-degree backends.  A thin QR factorization Q·R of the
+evaluation columns of the standard monomials O found so far is kept.  The
+column of a candidate t is projected on the complement of Q.  The norm of
+the residual is exactly the smallest value ‖g(X)‖ over the polynomials
+g = t − Σ a_o·o with o in O, and the minimizing coefficients are its
+coordinates on Q multiplied by R⁻¹.  If that value is small enough, g
+becomes a generator with leading term t; otherwise t joins O and its
+normalized residual extends Q.  The polynomial g is compared with ``eps`` after
+division by the norm of its coefficients (1, −a).
+
+All the columns of a degree are formed at once as coordinate multiples of
+the columns of degree d − 1 and projected with matrix products; within a
+degree, each accepted column is removed from the remaining ones by a
+rank-one update.  R⁻¹ is kept instead of R and grown block by block, so
+the coefficients of a candidate cost a matrix-vector product rather than
+a solve.  The cost is O(n·m²) for m standard monomials: the
+quadric through 10⁵ noisy points of a circle or a sphere is found in a
+fraction of a second.
+
+``eps`` is an absolute tolerance on values of polynomials of unit
+coefficient norm, so it should be chosen on the noise scale of the data;
+points moved into [−1, 1]ⁿ first (``normalize=True``) keep the monomial
+columns comparable, and the test then applies in those coordinates.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import numpy as np
+
+from evaluation import point_array
+from monomials import MonomialIdeal, exponents_of_degree, next_layer, term_order
+from numeric import layer_columns, project_out
+
+
+def approximate_polynomials(pts, max_degree, eps=1e-3, order="grlex"):
+    """
+    Yield (d, exps, coeffs) degree by degree like
+    numeric.incremental_numeric_polynomials, where each row of coeffs is
+    a monic polynomial, with its leading monomial in its last nonzero
+    column, whose RMS value on the points is at most `eps` times the norm
+    of its coefficient vector.
+    Stop after `max_degree` or once a degree adds no standard monomial.
+    """
+    order = term_order(order)
+    P = point_array(pts)
+    n, nvars = P.shape
+    bound = eps * np.sqrt(n)
+    lead = MonomialIdeal(nvars)
+    Q, Rinv = np.empty((n, 0)), np.empty((0, 0))
+    std = np.empty((0, nvars), dtype=np.int64)
+    prev_exps, prev_cols = std, np.empty((n, 0))
+    for d in range(max_degree + 1):
+        layer = exponents_of_degree(nvars, 0) if d == 0 else next_layer(prev_exps, lead)
+        layer = layer[order.argsort(layer)]
+        m = len(layer)
+        s = len(std)
+        C = layer_columns(P, layer, prev_exps, prev_cols)
+        H, Cr = project_out(Q, C)
+        # coordinates of the layer's columns on the earlier standard monomials
+        W = Rinv @ H
+
+        # sweep the layer in order: a small residual gives a generator,
+        # a large one a standard monomial removed from the later columns.
+        # Tinv is the inverse of the triangular block Hn[:k, keep] so far.
+        Hn = np.zeros((m, m))
+        Tinv = np.zeros((m, m))
+        coeffs = np.zeros((0, s + m))
+        keep, pivots, new_q = [], [], []
+        for j in range(m):
+            norm = np.linalg.norm(Cr[:, j])
+            # ‖g(X)‖ = norm for g = t − Σ a·o − Σ b·u (o earlier, u kept in this layer)
+            k = len(keep)
+            b = Tinv[:k, :k] @ Hn[:k, j]
+            a = W[:, j] - W[:, keep] @ b
+            if norm <= bound * np.sqrt(1.0 + a @ a + b @ b):
+                row = np.zeros(s + m)
+                row[:s] = -a
+                row[s + np.array(keep, dtype=np.int64)] = -b
+                row[s + j] = 1.0
+                coeffs = np.vstack([coeffs, row])
+                pivots.append(j)
+                continue
+            q = Cr[:, j] / norm
+            Hn[k, j] = norm
+            Hn[k, j + 1:] = q @ Cr[:, j + 1:]
+            Cr[:, j + 1:] -= np.outer(q, Hn[k, j + 1:])
+            Tinv[:k, k] = -b / norm
+            Tinv[k, k] = 1.0 / norm
+            keep.append(j)
+            new_q.append(q)
+        # R grows to [[R, H_keep], [0, T]], whose inverse is
+        # [[R⁻¹, −R⁻¹·H_keep·T⁻¹], [0, T⁻¹]]
+        k = len(keep)
+        T = Tinv[:k, :k]
+        Rinv = np.block([[Rinv, -W[:, keep] @ T], [np.zeros((k, s)), T]])
+        Q = np.hstack([Q] + [q[:, None] for q in new_q])
+
+        yield d, np.vstack([std, layer]), coeffs
+
+        for j in pivots:
+            lead.add(layer[j])
+        std = np.vstack([std, layer[keep]])
+        prev_exps, prev_cols = layer[keep], C[:, keep]
+        if not keep:
+            return
@@ -0,0 +1,192 @@
+"""Compute the vanishing ideals of many point sets in a pool of processes.
+
+Point sets are read from
+  * .npy files: an (n, d) array is one set, a (k, n, d) array is k sets of
+    the same size, and an object array holds one (n, d) array per set.
+    Object arrays are pickled, and unpickling runs code chosen by whoever
+    wrote the file, so they are only read with --allow-pickle;
+  * .npz files: every array of the archive, in order, read as above;
+  * JSON lines files (.jsonl, .json, .ndjson): one set per line, either a
+    list of points or an object with a "points" key.  Coordinates may be
+    numbers or strings such as "1/3" for exact rationals.
+
+The sets are grouped into chunks and handed to a ProcessPoolExecutor whose
+workers import the engine and receive the computation options once, when
+they start.  A chunk travels as one pickled message each way, so small sets
+do not pay one round trip each; only a bounded number of chunks are in
+flight, and results are yielded back in input order as soon as they are
+ready.
+
+Usage:
+    python batch.py sets.jsonl [--backend bm] [--order grlex] [--workers 8]
+                               [--chunksize 32] [--allow-pickle] [-o results.jsonl]
+
+Each result is written as a JSON line with the index of the set, its
+standard monomials and its generators (leading exponent and terms, exact
+coefficients as "p/q" strings).
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from itertools import islice
+
+import numpy as np
+
+from evaluation import to_fraction
+import vanishing
+
+BatchResult = namedtuple("BatchResult", "index standard generators elapsed")
+
+
+# ---------------------------------------------------------------------
+# Input
+# ---------------------------------------------------------------------
+def _coordinate(c):
+    if isinstance(c, str):
+        return Fraction(c)
+    return c
+
+def _array_sets(arr):
+    if arr.dtype == object:
+        for a in arr:
+            yield from _array_sets(np.asarray(a))
+    elif arr.ndim == 2:
+        yield arr.tolist()
+    elif arr.ndim == 3:
+        yield from (a.tolist() for a in arr)
+    else:
+        raise ValueError(f"cannot read point sets from an array of shape {arr.shape}")
+
+def read_point_sets(path, allow_pickle=False):
+    """
+    Yield the point sets stored in `path` (.npy, .npz or JSON lines), as
+    lists of tuples.  Object arrays are only loaded with `allow_pickle`,
+    for files from a trusted source.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        arrays = [np.load(path, allow_pickle=allow_pickle)]
+    elif ext == ".npz":
+        with np.load(path, allow_pickle=allow_pickle) as data:
+            arrays = [data[name] for name in data.files]
+    else:
+        arrays = None
+    if arrays is not None:
+        for arr in arrays:
+            for pts in _array_sets(arr):
+                yield [tuple(pt) for pt in pts]
+        return
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                record = record["points"]
+            yield [tuple(_coordinate(c) for c in pt) for pt in record]
+
+
+# ---------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------
+_options = {}
+
+def _init_worker(options):
+    _options.clear()
+    _options.update(options)
+
+def _plain(c):
+    """A coefficient as a float or a Fraction, which pickle compactly."""
+    return c if isinstance(c, float) else to_fraction(c)
+
+def _solve_chunk(chunk):
+    """Compute the ideal of every (index, points) pair of the chunk."""
+    out = []
+    for index, pts in chunk:
+        start = time.perf_counter()
+        ideal = vanishing.vanishing_ideal(pts, **_options)
+        standard = [m for step in ideal.steps for m in step.standard]
+        gens = [(g.lead, {e: _plain(c) for e, c in g.terms.items()}) for g in ideal.generators]
+        out.append(BatchResult(index, standard, gens, time.perf_counter() - start))
+    return out
+
+def solve_batch(point_sets, workers=None, chunksize=16, **options):
+    """
+    Yield a BatchResult for every point set of the iterable, in order.
+
+    `options` are those of vanishing.vanishing_ideal (backend, order,
+    max_degree, ...).  Sets are sent to `workers` processes in chunks of
+    `chunksize`; at most two chunks per worker are in flight, so the
+    input can be a lazy stream.  Generators are (lead, {exponent: coeff})
+    pairs.
+    """
+    workers = workers or os.cpu_count() or 1
+    numbered = enumerate(point_sets)
+    chunks = iter(lambda: list(islice(numbered, chunksize)), [])
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(options,)) as pool:
+        pending = deque(pool.submit(_solve_chunk, c) for c in islice(chunks, 2 * workers))
+        while pending:
+            results = pending.popleft().result()
+            for c in islice(chunks, 1):
+                pending.append(pool.submit(_solve_chunk, c))
+            yield from results
+
+
+# ---------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------
+def _coefficient(c):
+    if isinstance(c, float):
+        return c
+    return c.numerator if c.denominator == 1 else f"{c.numerator}/{c.denominator}"
+
+def result_record(result):
+    """Return a BatchResult as a JSON-serializable dict."""
+    return {
+        "index": result.index,
+        "standard": [list(m) for m in result.standard],
+        "generators": [{"lead": list(lead),
+                        "terms": [[list(e), _coefficient(c)] for e, c in terms.items()]}
+                       for lead, terms in result.generators],
+        "elapsed": result.elapsed,
+    }
+
+
+# ---------------------------------------------------------------------
+# Command‑line interface
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vanishing ideals of many point sets.")
+    parser.add_argument("input", help=".npy, .npz or JSON lines file of point sets")
+    parser.add_argument("-o", "--output", help="JSON lines output (default: stdout)")
+    parser.add_argument("--backend", default="bm")
+    parser.add_argument("--order", default="grlex")
+    parser.add_argument("--max-degree", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument("--allow-pickle", action="store_true",
+                        help="read object arrays from .npy/.npz files (trusted files only)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        results = solve_batch(read_point_sets(args.input, args.allow_pickle), args.workers, args.chunksize,
+                              backend=args.backend, order=args.order,
+                              max_degree=args.max_degree)
+        for result in results:
+            out.write(json.dumps(result_record(result)) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark point insertion against full recomputation.
+
+For a planar and a spatial point set, grow the set one random integer point
+at a time and compare the cost of `VanishingIdeal.add_point` with running
+`vanishing_ideal` again on the enlarged set.
+
+Usage:
+    python bench_insert.py [start] [inserts]
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import random
+import sys
+import time
+
+import sympy as sp
+
+import vanishing
+
+
+def random_points(count, nvars, rng, spread=20):
+    """Return `count` distinct random integer points."""
+    pts = set()
+    while len(pts) < count:
+        pts.add(tuple(rng.randint(-spread, spread) for _ in range(nvars)))
+    return sorted(pts)
+
+def bench(symbols, start, inserts, seed=0):
+    """Yield (size, insert seconds, recompute seconds) after each insertion."""
+    rng = random.Random(seed)
+    pts = random_points(start + inserts, len(symbols), rng)
+    ideal = vanishing.vanishing_ideal(pts[:start], symbols)
+    for k in range(start, start + inserts):
+        t0 = time.perf_counter()
+        ideal.add_point(pts[k])
+        t1 = time.perf_counter()
+        vanishing.vanishing_ideal(pts[:k + 1], symbols)
+        t2 = time.perf_counter()
+        yield k + 1, t1 - t0, t2 - t1
+
+
+# ---------------------------------------------------------------------
+# Command‑line interface
+def main():
+    start = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    inserts = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    for name, symbols in (("2D", sp.symbols("x y")), ("3D", sp.symbols("x y z"))):
+        print(f"{name}: {start} points, then {inserts} insertions")
+        print(f"{'points':>8} {'add_point (ms)':>16} {'recompute (ms)':>16} {'speed-up':>10}")
+        total_add = total_full = 0.0
+        for n, t_add, t_full in bench(symbols, start, inserts):
+            total_add += t_add
+            total_full += t_full
+            print(f"{n:>8} {1e3 * t_add:>16.2f} {1e3 * t_full:>16.2f} {t_full / t_add:>9.1f}x")
+        print(f"{'total':>8} {1e3 * total_add:>16.2f} {1e3 * total_full:>16.2f} "
+              f"{total_full / total_add:>9.1f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
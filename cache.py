@@ -0,0 +1,176 @@
+"""Persistent, content-addressed cache of computed vanishing ideals.
+
+A computation is identified by its point set and settings, not by how the
+caller wrote them down: the points are converted to exact rationals,
+deduplicated and sorted, and hashed (SHA-256) together with the term
+order, the backend, the number of variables and any option that changes
+the result.  Two calls on the same set in a different order, with
+duplicates or with 1 written as 1.0, share one entry.
+
+Entries hold the per-degree staircase and generators as plain tuples of
+ints and floats (rational coefficients as numerator/denominator pairs),
+pickled and zlib-compressed, one file per entry under ``path``.  The disk
+tier is bounded by ``max_bytes`` and evicts least recently used entries
+(a hit refreshes the file's modification time); a small in-memory LRU
+tier in front of it answers repeated lookups without touching the disk.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from collections import OrderedDict
+from fractions import Fraction
+
+from evaluation import to_fraction
+
+FORMAT = 2
+
+def default_path():
+    """The cache directory: $VANISHING_CACHE, or ~/.cache/vanishing."""
+    return os.environ.get("VANISHING_CACHE",
+                          os.path.join(os.path.expanduser("~"), ".cache", "vanishing"))
+
+
+# ---------------------------------------------------------------------
+# Keys and encoding
+# ---------------------------------------------------------------------
+def point_set_key(points, nvars, backend, order, settings=()):
+    """
+    Return the hex key of a computation.
+
+    `points` are tuples of exact rationals, ints or Fractions (in any
+    order, possibly repeated); `settings` are extra (name, value) pairs
+    that change the result.  Points are sorted as tuples of
+    (numerator, denominator) pairs: any fixed order will do, and integer
+    comparisons are much cheaper than Fraction ones.
+    """
+    canon = sorted({tuple((c.numerator, c.denominator) for c in pt) for pt in points})
+    text = repr((FORMAT, backend, repr(order), nvars, sorted(settings), canon))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def _pack_coeff(c):
+    if isinstance(c, float):
+        return c
+    c = to_fraction(c)
+    return (c.numerator, c.denominator)
+
+def _unpack_coeff(c):
+    return c if isinstance(c, float) else Fraction(*c)
+
+def encode(steps):
+    """
+    Serialize a list of (d, monos, standard, generators, elapsed, skipped)
+    steps, generators being (lead, {exponent: coefficient}) pairs.
+    """
+    plain = [(d, tuple(monos), tuple(standard),
+              tuple((lead, tuple((e, _pack_coeff(c)) for e, c in terms.items()))
+                    for lead, terms in gens),
+              elapsed, bool(skipped))
+             for d, monos, standard, gens, elapsed, skipped in steps]
+    return zlib.compress(pickle.dumps(plain, pickle.HIGHEST_PROTOCOL))
+
+def decode(blob):
+    """Inverse of :func:`encode`."""
+    return [(d, list(monos), list(standard),
+             [(lead, {e: _unpack_coeff(c) for e, c in terms}) for lead, terms in gens],
+             elapsed, skipped)
+            for d, monos, standard, gens, elapsed, skipped in pickle.loads(zlib.decompress(blob))]
+
+
+# ---------------------------------------------------------------------
+# Two-tier store
+# ---------------------------------------------------------------------
+class ResultCache:
+    """
+    LRU cache of encoded results: `memory_items` decoded entries in memory
+    in front of at most `max_bytes` of files under `path`.
+    """
+
+    def __init__(self, path=None, max_bytes=256 * 2 ** 20, memory_items=1024):
+        self.path = default_path() if path is None else path
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self.hits = self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+        self._sizes = {}
+        for name in os.listdir(self.path):
+            if name.endswith(".bin"):
+                self._sizes[name] = os.path.getsize(os.path.join(self.path, name))
+        self._total = sum(self._sizes.values())
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".bin")
+
+    def get(self, key):
+        """Return the decoded steps stored under `key`, or None."""
+        steps = self._memory.get(key)
+        if steps is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return steps
+        name = key + ".bin"
+        if name not in self._sizes:
+            self.misses += 1
+            return None
+        try:
+            with open(self._file(key), "rb") as f:
+                steps = decode(f.read())
+            os.utime(self._file(key))
+        except (OSError, ValueError, zlib.error, pickle.UnpicklingError):
+            self._forget(name)
+            self.misses += 1
+            return None
+        self._remember(key, steps)
+        self.hits += 1
+        return steps
+
+    def put(self, key, steps):
+        """Store `steps` under `key` in both tiers and evict old entries."""
+        blob = encode(steps)
+        self._remember(key, steps)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, self._file(key))
+        name = key + ".bin"
+        self._total += len(blob) - self._sizes.get(name, 0)
+        self._sizes[name] = len(blob)
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def clear(self):
+        """Remove every entry."""
+        self._memory.clear()
+        for name in list(self._sizes):
+            self._forget(name)
+
+    def _remember(self, key, steps):
+        self._memory[key] = steps
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _forget(self, name):
+        try:
+            os.remove(os.path.join(self.path, name))
+        except OSError:
+            pass
+        self._total -= self._sizes.pop(name, 0)
+
+    def _evict(self):
+        # drop least recently used files until the cache is down to 90% of the bound
+        by_age = sorted(self._sizes, key=lambda name: os.path.getmtime(os.path.join(self.path, name)))
+        for name in by_age:
+            if self._total <= 0.9 * self.max_bytes:
+                break
+            self._memory.pop(name[:-4], None)
+            self._forget(name)
@@ -0,0 +1,177 @@
+"""Evaluation matrices of monomials at a point set, built from power tables.
+
+Instead of substituting every point into every monomial, the powers
+x_i^0, …, x_i^d of each coordinate are tabulated once for all points, and
+the column of a monomial x^e is the elementwise product of the table rows
+T[i][e_i].  The same code serves float inputs (float64 arrays, fully
+vectorized) and exact inputs (object arrays of int, Fraction or SymPy
+numbers).
+
+For large float point sets, :class:`SharedEvaluator` fills the rows of
+the matrix block by block in a pool of worker processes.  The points and
+the matrix live in ``multiprocessing.shared_memory`` segments, so workers
+write their rows in place and the parent reads the result without any
+copy or pickling of the data.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import numbers
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def to_fraction(value):
+    """
+    Convert a point coordinate (int, Fraction, float, NumPy or SymPy
+    number) exactly to a Fraction with plain int numerator and denominator.
+    """
+    if isinstance(value, numbers.Rational):
+        return Fraction(int(value.numerator), int(value.denominator))
+    if isinstance(value, numbers.Real) and not isinstance(value, float):
+        value = float(value)
+    return Fraction(value)
+
+def point_array(pts, exact=False):
+    """Return the points as an (n, nvars) array: float64, or object for exact values."""
+    if exact:
+        arr = np.empty((len(pts), len(pts[0]) if pts else 0), dtype=object)
+        arr[:] = [tuple(pt) for pt in pts]
+        return arr
+    return np.asarray(pts, dtype=float).reshape(len(pts), -1)
+
+def power_tables(P, deg: int, tables=None):
+    """
+    Return T with T[i, k] = P[:, i] ** k for k ≤ deg, shape (nvars, deg + 1, n).
+
+    If `tables` is given, its rows are reused and only the missing powers
+    are computed.
+    """
+    n, nvars = P.shape
+    have = 0 if tables is None else tables.shape[1]
+    if have > deg:
+        return tables
+    T = np.empty((nvars, deg + 1, n), dtype=P.dtype)
+    if have:
+        T[:, :have] = tables
+    else:
+        T[:, 0] = 1
+        have = 1
+    for k in range(have, deg + 1):
+        T[:, k] = T[:, k - 1] * P.T
+    return T
+
+def evaluation_matrix(P, exps, tables=None):
+    """
+    Return the n × m matrix whose (i, j) entry is monomial exps[j] at P[i].
+
+    `tables` are power tables for P (see :func:`power_tables`); they are
+    computed if missing or too short.
+    """
+    n, nvars = P.shape
+    E = np.asarray(exps, dtype=np.int64).reshape(len(exps), nvars)
+    if not len(exps):
+        return np.empty((n, 0), dtype=P.dtype)
+    tables = power_tables(P, int(E.max()), tables)
+    cols = tables[0, E[:, 0]]
+    for i in range(1, nvars):
+        cols = cols * tables[i, E[:, i]]
+    return cols.T
+
+def values_from_parent(t, values, coords, n):
+    """
+    Return the values of the monomial t at the n points as a list, from
+    those of a parent t / x_i in `values` ({monomial: list of values});
+    coords[i] lists the i-th coordinates.  Without a parent, t is 1.
+    """
+    for i, e in enumerate(t):
+        if e:
+            parent = t[:i] + (e - 1,) + t[i + 1:]
+            if parent in values:
+                xi = coords[i]
+                pv = values[parent]
+                return [pv[j] * xi[j] for j in range(n)]
+    return [Fraction(1)] * n
+
+
+# ---------------------------------------------------------------------
+# Parallel construction in shared memory
+# ---------------------------------------------------------------------
+_points = None  # (segment, array) of the points, in each worker
+
+def _attach_points(name, shape):
+    global _points
+    shm = shared_memory.SharedMemory(name=name)
+    _points = (shm, np.ndarray(shape, dtype=float, buffer=shm.buf))
+
+def _fill_rows(name, shape, exps, start, stop):
+    """Write the rows start:stop of the evaluation matrix into the segment `name`."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        M = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        M[start:stop] = evaluation_matrix(_points[1][start:stop], exps)
+        del M
+    finally:
+        shm.close()
+
+class SharedEvaluator:
+    """
+    Build float evaluation matrices of the points P in `workers` processes.
+
+    Use it as a context manager, which copies P once into shared memory
+    and starts the pool; :meth:`apply` then hands the evaluation matrix of
+    a list of exponents to a function, each worker filling blocks of
+    `block` rows:
+
+        with SharedEvaluator(P, workers=8) as ev:
+            K = ev.apply(exps, kernel)
+    """
+
+    def __init__(self, P, workers=None, block=None):
+        self.P = np.ascontiguousarray(P, dtype=float)
+        self.workers = workers or os.cpu_count() or 1
+        # a few blocks per worker balance the load without many round trips
+        self.block = block or max(1024, -(-len(self.P) // (4 * self.workers)))
+        self._shm = self._pool = None
+
+    def __enter__(self):
+        self._shm = shared_memory.SharedMemory(create=True, size=max(self.P.nbytes, 1))
+        np.ndarray(self.P.shape, dtype=float, buffer=self._shm.buf)[:] = self.P
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_attach_points,
+                                         initargs=(self._shm.name, self.P.shape))
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown()
+        self._shm.close()
+        self._shm.unlink()
+        self._pool = self._shm = None
+
+    def apply(self, exps, func):
+        """
+        Return func(M) for the n × m evaluation matrix M of `exps` (see
+        :func:`evaluation_matrix`), filled by the workers.  M is a view of
+        a shared segment that is released when func returns, so func must
+        not keep a reference to it.
+        """
+        E = np.ascontiguousarray(exps, dtype=np.int64).reshape(len(exps), self.P.shape[1])
+        shape = (len(self.P), len(E))
+        shm = shared_memory.SharedMemory(create=True, size=max(8 * shape[0] * shape[1], 1))
+        M = None
+        try:
+            futures = [self._pool.submit(_fill_rows, shm.name, shape, E, start,
+                                         min(start + self.block, shape[0]))
+                       for start in range(0, shape[0], self.block)]
+            for f in futures:
+                f.result()
+            M = np.ndarray(shape, dtype=float, buffer=shm.buf)
+            return func(M)
+        finally:
+            M = None
+            shm.close()
+            shm.unlink()
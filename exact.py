@@ -0,0 +1,110 @@
+"""Exact per-degree backend on SymPy's DomainMatrix.
+
+The original exact procedure puts the evaluation matrix in an ``sp.Matrix``
+of generic expressions, so every pivot of the null-space computation goes
+through symbolic arithmetic and simplification.  Here the matrix lives in
+the ground domain ZZ instead:
+
+1. points are converted to exact rationals (floats are taken at their
+   exact binary value, as in the Buchberger–Möller engine);
+2. each row of the evaluation matrix is multiplied by the common
+   denominator of its entries, which does not change the null-space, so
+   rational point sets give an integer matrix as well;
+3. the null-space is read from the fraction-free (Bareiss) reduced echelon
+   form of ``DomainMatrix.rref_den`` over ZZ, with no division until the
+   final normalization of each kernel vector.
+
+Columns are sorted in increasing term order, so every kernel vector ends
+with its free column, which is its leading monomial.
+
+Low degrees of large point sets usually have no kernel at all.  Before
+building the exact matrix, its rank is tested modulo a random prime
+(modular.RankCheck); full column rank there proves that the null-space is
+trivial, and the degree is done without any exact elimination.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+from fractions import Fraction
+from math import lcm
+
+import numpy as np
+from sympy import ZZ
+from sympy.polys.matrices import DomainMatrix
+
+from evaluation import evaluation_matrix, point_array, power_tables, to_fraction
+from modular import RankCheck
+from monomials import MonomialIdeal, exponents_of_degree, next_layer, term_order
+
+
+def integer_rows(M):
+    """Return the rows of the object array M of Fractions scaled to integers."""
+    rows = []
+    for row in M.tolist():
+        den = lcm(*(c.denominator for c in row))
+        rows.append([ZZ(c.numerator * (den // c.denominator)) for c in row])
+    return rows
+
+def domain_nullspace(rows, ncols):
+    """
+    Return the null-space of the integer matrix `rows` as lists of Fractions.
+
+    Each vector is normalized so that its last nonzero entry, at its free
+    column, is 1.
+    """
+    if not rows:
+        return [[Fraction(int(j == k)) for j in range(ncols)] for k in range(ncols)]
+    M = DomainMatrix(rows, (len(rows), ncols), ZZ)
+    R, den, pivots = M.rref_den(method="FF")
+    R = R.to_list()
+    basis = []
+    for f in sorted(set(range(ncols)) - set(pivots)):
+        vec = [Fraction(0)] * ncols
+        vec[f] = Fraction(1)
+        for i, p in enumerate(pivots):
+            if R[i][f]:
+                vec[p] = Fraction(-int(R[i][f]), int(den))
+        basis.append(vec)
+    return basis
+
+def domain_polynomials(pts, max_degree, order="grlex", precheck=True):
+    """
+    Yield (d, exps, polys) degree by degree, where exps is the (m, nvars)
+    array of exponents of degree ≤ d not divisible by an earlier leading
+    monomial, in increasing graded `order`, and polys is a list of
+    coefficient lists (Fractions, aligned with exps) of vanishing
+    polynomials, each ending with a 1 at its leading monomial.
+    Stop after `max_degree` or once a degree adds no standard monomial.
+
+    With `precheck`, polys is None for the degrees whose matrix has full
+    column rank modulo a random prime: their null-space is empty and was
+    not computed.
+    """
+    order = term_order(order)
+    P = point_array([[to_fraction(c) for c in pt] for pt in pts], exact=True)
+    check = RankCheck(P.tolist()) if precheck else None
+    nvars = P.shape[1]
+    lead = MonomialIdeal(nvars)
+    tables = None
+    std = np.empty((0, nvars), dtype=np.int64)
+    layer = exponents_of_degree(nvars, 0)
+    for d in range(max_degree + 1):
+        exps = np.vstack([std, layer])
+        exps = exps[order.argsort(exps)]
+        tables = power_tables(P, d, tables)
+        if check is not None and check.full_rank(exps):
+            polys, leads = None, []
+        else:
+            rows = integer_rows(evaluation_matrix(P, exps, tables))
+            polys = domain_nullspace(rows, len(exps))
+            leads = [max(j for j, c in enumerate(vec) if c) for vec in polys]
+        for j in leads:
+            lead.add(exps[j])
+        yield d, exps, polys
+        # the staircase is closed once degree d adds no standard monomial
+        if len(layer) == len(leads):
+            return
+        layer = layer[~lead.contains_many(layer)]
+        std = np.vstack([std, layer])
+        layer = next_layer(layer, lead)
@@ -0,0 +1,211 @@
+"""Divide-and-conquer construction of vanishing ideals.
+
+For disjoint point sets A and B the ideal of A ∪ B is the intersection of
+their ideals, so it can be built from the ideal of A instead of from
+scratch.  Keep the reduced Gröbner basis, the standard monomials S_A and
+the separators of A (the dual basis of S_A: sep_p is 1 at p and 0 at the
+other points of A).  Then:
+
+* every standard monomial of A stays standard, since I(A ∪ B) ⊆ I(A);
+* for any other monomial t, g_t = t − NF_A(t) lies in I(A), and the
+  normal form is read from the separators, NF_A(t) = Σ t(p)·sep_p;
+* f ∈ I(A) vanishes on A ∪ B iff f(B) = 0, so Buchberger–Möller only
+  has to run on the vectors g_t(B), of length |B| instead of |A| + |B|.
+  A vector that reduces to zero gives a generator with leading term t;
+  otherwise t joins the staircase.
+
+The separators of the union come out of the same elimination: those of B's
+points are the combinations of the g_u (u a new standard monomial) with
+values e_q on B, and those of A's points are corrected by them.
+
+:func:`divide_and_conquer` splits the points into shards, builds each
+shard's ideal in a worker process (with Buchberger–Möller when called
+from vanishing.py, or by merging single points), then merges pairs of
+ideals up a tree, the merges of a level running in parallel.
+Polynomials are dicts {exponent tuple: Fraction} as in update.py.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from math import lcm, prod
+
+from sympy import QQ
+from sympy.polys.matrices import DomainMatrix
+
+from evaluation import values_from_parent
+from monomials import Border, term_order
+
+# points: distinct exact points; standard: standard monomials in increasing
+# order; generators: {lead: poly}; separators: one poly per point
+Shard = namedtuple("Shard", "points standard generators separators")
+
+
+def point_ideal(p):
+    """The ideal of the single point p: ⟨x_i − p_i⟩, staircase {1}, separator 1."""
+    nvars = len(p)
+    one = (0,) * nvars
+    gens = {}
+    for i in range(nvars):
+        e = one[:i] + (1,) + one[i + 1:]
+        gens[e] = {e: Fraction(1), one: -p[i]} if p[i] else {e: Fraction(1)}
+    return Shard([p], [one], gens, [{one: Fraction(1)}])
+
+def _from_dual(poly, coords, separators):
+    """Add Σ coords[p]·separators[p] to the polynomial `poly` in place."""
+    for c, f in zip(coords, separators):
+        if c:
+            for e, a in f.items():
+                poly[e] = poly.get(e, 0) + c * a
+    return {e: c for e, c in poly.items() if c}
+
+def _integral(values):
+    """Return (den, ints) with values = ints / den, for fast integer dot products."""
+    den = lcm(*(Fraction(c).denominator for c in values))
+    return den, [int(c * den) for c in values]
+
+def merge(a, b, order="grlex", with_separators=True):
+    """
+    Return the Shard of the union of two disjoint point sets from theirs.
+
+    The larger side keeps its basis and separators; only the other
+    side's points are used (see the module docstring).  The points of the
+    result are the larger side's followed by the other's.  Without
+    `with_separators` the separators of the union, the costliest part,
+    are left out (None).
+    """
+    order = term_order(order)
+    if len(a.points) < len(b.points):
+        a, b = b, a
+    na, nb = len(a.points), len(b.points)
+    pts = a.points + b.points
+    n, nvars = len(pts), len(pts[0])
+    coords = [[p[i] for p in pts] for i in range(nvars)]
+    # transfer[q][p]: the separator of A's p-th point at B's q-th point
+    # the transfer products dominate the cost; they are taken over the integers
+    seps = [_integral([f.get(s, 0) for s in a.standard]) for f in a.separators]
+    transfer = []
+    for q in b.points:
+        d, row = _integral([prod(c ** e for c, e in zip(q, s)) for s in a.standard])
+        transfer.append([Fraction(sum(x * y for x, y in zip(row, ints) if x), d * den)
+                         for den, ints in seps])
+    scaled = [_integral(row) for row in transfer]
+
+    standard_a = set(a.standard)
+    border = Border(nvars, order)
+    values = {}
+    std = []
+    new = []  # (u, values of u on A, vector g_u(B)) for new standard monomials
+    basis = []  # echelon rows (pivot, row, combination over `new`)
+    gens = {}
+    for t in border:
+        v = values_from_parent(t, values, coords, n)
+        if t in standard_a:
+            std.append(t)
+            values[t] = v
+            border.standard(t)
+            continue
+        on_a, on_b = v[:na], v[na:]
+        # g_t(B) = t(B) − NF_A(t)(B)
+        den, ints = _integral(on_a)
+        r = [on_b[k] - Fraction(sum(x * y for x, y in zip(row, ints) if y), den * d)
+             for k, (d, row) in enumerate(scaled)]
+        row = list(r)
+        comb = [Fraction(0)] * len(new)
+        for pivot, brow, bcomb in basis:
+            f = row[pivot]
+            if f:
+                for j in range(nb):
+                    if brow[j]:
+                        row[j] -= f * brow[j]
+                for k, c in enumerate(bcomb):
+                    if c:
+                        comb[k] -= f * c
+        pivot = next((j for j in range(nb) if row[j]), None)
+        if pivot is None:
+            # g_t + Σ comb_k·g_u_k vanishes on A ∪ B
+            border.lead(t)
+            poly = {t: Fraction(1)}
+            dual = list(on_a)
+            for c, (u, u_a, _) in zip(comb, new):
+                if c:
+                    poly[u] = c
+                    for p in range(na):
+                        dual[p] += c * u_a[p]
+            gens[t] = _from_dual(poly, [-c for c in dual], a.separators)
+            continue
+        inv = 1 / row[pivot]
+        basis.append((pivot, [x * inv for x in row], [c * inv for c in comb] + [inv]))
+        new.append((t, on_a, r))
+        std.append(t)
+        values[t] = v
+        border.standard(t)
+    if not with_separators:
+        return Shard(pts, order.sorted(std), gens, None)
+
+    # separators of B's points: Σ_k C[k][q]·g_u_k with Σ_k C[k][q]·g_u_k(B) = e_q
+    W = DomainMatrix([[QQ(r[j].numerator, r[j].denominator) for _, _, r in new]
+                      for j in range(nb)], (nb, nb), QQ)
+    C = [[Fraction(int(c.numerator), int(c.denominator)) for c in row]
+         for row in W.inv().to_list()]
+    seps_b = []
+    for q in range(nb):
+        poly, dual = {}, [Fraction(0)] * na
+        for k, (u, u_a, _) in enumerate(new):
+            c = C[k][q]
+            if c:
+                poly[u] = c
+                for p in range(na):
+                    dual[p] -= c * u_a[p]
+        seps_b.append(_from_dual(poly, dual, a.separators))
+    # separators of A's points: make them vanish on B
+    seps_a = []
+    for p, f in enumerate(a.separators):
+        poly = dict(f)
+        for q in range(nb):
+            c = transfer[q][p]
+            if c:
+                for e, x in seps_b[q].items():
+                    poly[e] = poly.get(e, 0) - c * x
+        seps_a.append({e: x for e, x in poly.items() if x})
+    return Shard(pts, order.sorted(std), gens, seps_a + seps_b)
+
+def build(pts, order="grlex"):
+    """Return the Shard of the distinct exact points `pts`, merging halves recursively."""
+    if len(pts) == 1:
+        return point_ideal(pts[0])
+    half = len(pts) // 2
+    return merge(build(pts[:half], order), build(pts[half:], order), order)
+
+def _merge_pair(args):
+    return merge(*args)
+
+def divide_and_conquer(pts, shards=None, workers=None, order="grlex", leaf=build):
+    """
+    Return the Shard of the points `pts` (tuples of Fractions, possibly
+    repeated), built from `shards` parts in `workers` processes.
+
+    Each shard's ideal is built in a worker by `leaf(points, order)`, a
+    picklable function returning a Shard with separators (:func:`build`
+    by default).  The shard ideals are then merged pairwise, level by
+    level, each level's merges running in parallel.  The final merge
+    skips the separators, so the result has none.
+    """
+    pts = list(dict.fromkeys(pts))
+    workers = workers or os.cpu_count() or 1
+    shards = max(1, min(shards or workers, len(pts)))
+    size = -(-len(pts) // shards)
+    parts = [pts[k:k + size] for k in range(0, len(pts), size)]
+    with ProcessPoolExecutor(workers) as pool:
+        level = list(pool.map(leaf, parts, [order] * len(parts)))
+        while len(level) > 1:
+            last = len(level) == 2
+            pairs = [(level[k], level[k + 1], order, not last)
+                     for k in range(0, len(level) - 1, 2)]
+            merged = list(pool.map(_merge_pair, pairs))
+            level = merged + level[len(pairs) * 2:]
+    return level[0]
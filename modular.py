@@ -0,0 +1,325 @@
+"""Multi-modular exact backend for the vanishing-ideal engine.
+
+Over ℚ the coefficients of the Gröbner basis can grow large, and exact
+elimination with fractions pays for that growth at every step.  This
+module runs the Buchberger–Möller algorithm modulo several word-size
+primes instead:
+
+1. the rational points are reduced modulo each prime p;
+2. Buchberger–Möller runs over GF(p) on int64 NumPy arrays, keeping the
+   evaluation basis in reduced echelon form so that reducing a candidate
+   is a single vectorized product;
+3. primes whose staircase disagrees with the majority are discarded as
+   unlucky;
+4. the coefficients are lifted with the Chinese remainder theorem and
+   rational reconstruction, adding primes until the reconstruction holds;
+5. the lifted basis is checked against the original points modulo an
+   independent prime.
+
+The same arithmetic gives a cheap rank test for the per-degree exact
+backends (:class:`RankCheck`): the rank of an evaluation matrix modulo a
+prime is at most its rank over ℚ, so a matrix of full column rank modulo
+p has a trivial null-space and its exact elimination can be skipped.
+
+All primes are below 2**31, so a product of two residues fits in int64.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import random
+from collections import Counter
+from fractions import Fraction
+from math import isqrt
+
+import numpy as np
+
+from evaluation import to_fraction
+from monomials import Border, degree_groups
+
+
+def _is_prime(n: int):
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % q == 0:
+            return n == q
+    # deterministic Miller–Rabin for n < 3.3e24
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def primes_below(bound: int):
+    """Yield the primes below `bound` in decreasing order."""
+    n = bound - 1
+    while n > 1:
+        if _is_prime(n):
+            yield n
+        n -= 1
+
+WORD_BOUND = 2 ** 31
+
+def random_prime(rng=random):
+    """Return a random prime between 2**30 and 2**31."""
+    return next(primes_below(rng.randrange(2 ** 30, WORD_BOUND)))
+
+
+# ---------------------------------------------------------------------
+# Lifting
+# ---------------------------------------------------------------------
+def rational_reconstruction(a: int, m: int):
+    """
+    Return the fraction r/s with |r|, s ≤ √(m/2) and r ≡ a·s (mod m),
+    or None if there is no such fraction.
+    """
+    bound = isqrt(m // 2)
+    r0, r1 = m, a % m
+    s0, s1 = 0, 1
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+    if s1 == 0 or abs(s1) > bound:
+        return None
+    return Fraction(r1, s1)
+
+def crt(residues, moduli):
+    """Combine per-prime residue lists into one list of residues mod Π moduli."""
+    acc, m = list(residues[0]), moduli[0]
+    for res, p in zip(residues[1:], moduli[1:]):
+        inv = pow(m, -1, p)
+        acc = [a + m * ((r - a) * inv % p) for a, r in zip(acc, res)]
+        m *= p
+    return acc, m
+
+
+# ---------------------------------------------------------------------
+# Buchberger–Möller over GF(p)
+# ---------------------------------------------------------------------
+def _reduce_points(pts, p):
+    """Return the nvars × n array of coordinates mod p, or None if a denominator vanishes."""
+    rows = []
+    for coord in zip(*pts):
+        row = []
+        for c in coord:
+            if c.denominator % p == 0:
+                return None
+            row.append(c.numerator * pow(c.denominator, -1, p) % p)
+        rows.append(row)
+    return np.array(rows, dtype=np.int64).reshape(len(rows), len(pts))
+
+def bm_mod_p(coords, p, max_degree=None, order="grlex"):
+    """
+    Run Buchberger–Möller over GF(p) on the reduced coordinates `coords`,
+    visiting monomials in increasing `order`.
+
+    Return (standard, generators) where generators is a list of
+    (lead, coeffs) with coeffs the residues of the coefficients of the
+    standard monomials (in the order of `standard` at the time the
+    generator was found).
+    """
+    nvars, n = coords.shape
+    B = np.zeros((n, n), dtype=np.int64)  # reduced echelon evaluation basis
+    C = np.zeros((n, n), dtype=np.int64)  # row k of B as a combination of std
+    pivots = np.zeros(n, dtype=np.int64)
+    values = {}
+    std, gens = [], []
+    border = Border(nvars, order)
+
+    for t in border:
+        if max_degree is not None and sum(t) > max_degree:
+            if border.order.graded:
+                break
+            continue
+        v = np.ones(n, dtype=np.int64)
+        for i, e in enumerate(t):
+            parent = t[:i] + (e - 1,) + t[i + 1:]
+            if e and parent in values:
+                v = values[parent] * coords[i] % p
+                break
+        r = len(std)
+        f = v[pivots[:r]]
+        row = (v - (f[:, None] * B[:r] % p).sum(axis=0)) % p
+        comb = (-(f[:, None] * C[:r, :r] % p).sum(axis=0)) % p
+        nz = np.flatnonzero(row)
+        if nz.size == 0:
+            border.lead(t)
+            gens.append((t, comb))
+            continue
+        piv = nz[0]
+        inv = pow(int(row[piv]), p - 2, p)
+        row = row * inv % p
+        comb = np.append(comb, 1) * inv % p
+        # keep B fully reduced: clear the new pivot column in older rows
+        g = B[:r, piv].copy()
+        B[:r] = (B[:r] - g[:, None] * row % p) % p
+        C[:r, :r + 1] = (C[:r, :r + 1] - g[:, None] * comb % p) % p
+        B[r], C[r, :r + 1], pivots[r] = row, comb, piv
+        values[t] = v
+        std.append(t)
+        border.standard(t)
+    return std, gens
+
+
+# ---------------------------------------------------------------------
+# Multi-modular driver
+# ---------------------------------------------------------------------
+def modular_buchberger_moller(pts, max_degree=None, order="grlex", nprimes=2):
+    """
+    Buchberger–Möller over ℚ by multi-modular computation.
+
+    Same interface and output as vanishing.buchberger_moller: yield
+    (d, standard, generators) per degree with Fraction coefficients.
+    Start with `nprimes` primes and double their number until rational
+    reconstruction succeeds and passes the check prime.
+    """
+    pts = [tuple(to_fraction(c) for c in pt) for pt in pts]
+    primes = primes_below(WORD_BOUND)
+    runs = {}
+
+    def run_next():
+        for p in primes:
+            coords = _reduce_points(pts, p)
+            if coords is not None:
+                runs[p] = bm_mod_p(coords, p, max_degree, order)
+                return p
+        raise RuntimeError("ran out of primes for modular reconstruction")
+
+    for _ in range(nprimes):
+        run_next()
+    check = run_next()
+    while True:
+        std, gens, used = _lucky_runs(runs, check)
+        lifted = _lift(gens, runs, used)
+        if lifted is not None and _verify(pts, std, lifted, check):
+            break
+        for _ in range(len(used) - 1):
+            run_next()
+        check = run_next()
+
+    for d, std_d, gens_d in degree_groups(std, lifted):
+        yield d, std_d, gens_d
+
+def _lucky_runs(runs, check):
+    """Return the majority staircase, its generators and the primes agreeing with it."""
+    shapes = {p: (tuple(std), tuple(lt for lt, _ in gens))
+              for p, (std, gens) in runs.items() if p != check}
+    shape, _ = Counter(shapes.values()).most_common(1)[0]
+    used = [p for p, s in shapes.items() if s == shape]
+    std, gens = runs[used[0]]
+    return std, gens, used
+
+def _lift(gens, runs, used):
+    """Lift all generator coefficients to ℚ, or return None if reconstruction fails."""
+    residues = [np.concatenate([c for _, c in runs[p][1]]).tolist() if runs[p][1] else []
+                for p in used]
+    values, m = crt(residues, used)
+    fracs = []
+    for a in values:
+        f = rational_reconstruction(a, m)
+        if f is None:
+            return None
+        fracs.append(f)
+    std = runs[used[0]][0]
+    lifted, k = [], 0
+    for lt, c in gens:
+        terms = [(std[j], fracs[k + j]) for j in range(len(c)) if fracs[k + j]]
+        lifted.append((lt, terms))
+        k += len(c)
+    return lifted
+
+def _verify(pts, std, lifted, p):
+    """Check modulo the independent prime p that every lifted generator vanishes on pts."""
+    coords = _reduce_points(pts, p)
+    if coords is None:
+        return False
+    n = len(pts)
+    exps = np.array(std + [lt for lt, _ in lifted], dtype=np.int64).reshape(-1, coords.shape[0])
+    values = {}
+    for e in exps:
+        v = np.ones(n, dtype=np.int64)
+        for i, k in enumerate(e):
+            for _ in range(int(k)):
+                v = v * coords[i] % p
+        values[tuple(e.tolist())] = v
+    for lt, terms in lifted:
+        acc = values[lt].copy()
+        for e, c in terms:
+            if c.denominator % p == 0:
+                return False
+            cp = c.numerator * pow(c.denominator, -1, p) % p
+            acc = (acc + cp * values[e]) % p
+        if acc.any():
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------
+# Rank test modulo a random prime
+# ---------------------------------------------------------------------
+def evaluation_mod_p(coords, exps, p):
+    """Return the n × m evaluation matrix mod p of the (m, nvars) exponents `exps`."""
+    nvars, n = coords.shape
+    top = int(exps.max(initial=0))
+    powers = np.ones((nvars, top + 1, n), dtype=np.int64)
+    for k in range(1, top + 1):
+        powers[:, k] = powers[:, k - 1] * coords % p
+    M = np.ones((n, len(exps)), dtype=np.int64)
+    for i in range(nvars):
+        M = M * powers[i, exps[:, i]].T % p
+    return M
+
+def rank_mod_p(M, p):
+    """Return the rank over GF(p) of the int64 matrix M of residues."""
+    M = M.copy()
+    rows, cols = M.shape
+    rank = 0
+    for j in range(cols):
+        if rank == rows:
+            break
+        nz = np.flatnonzero(M[rank:, j])
+        if not len(nz):
+            continue
+        i = rank + nz[0]
+        M[[rank, i], j:] = M[[i, rank], j:]
+        M[rank, j:] = M[rank, j:] * pow(int(M[rank, j]), -1, p) % p
+        f = M[rank + 1:, j]
+        M[rank + 1:, j:] = (M[rank + 1:, j:] - f[:, None] * M[rank, j:] % p) % p
+        rank += 1
+    return rank
+
+class RankCheck:
+    """
+    Full-column-rank test for the evaluation matrices of fixed exact points.
+
+    The points are reduced once modulo a random prime p (another one is
+    drawn if a denominator vanishes).  :meth:`full_rank` is one-sided: True
+    proves that the matrix has full column rank over ℚ, while False may
+    also come from an unlucky p, so the exact computation must then run.
+    """
+
+    def __init__(self, pts, rng=random):
+        pts = [tuple(to_fraction(c) for c in pt) for pt in pts]
+        while True:
+            self.p = random_prime(rng)
+            self.coords = _reduce_points(pts, self.p)
+            if self.coords is not None:
+                break
+
+    def full_rank(self, exps):
+        """Whether the evaluation matrix of the (m, nvars) exponents `exps` has rank m."""
+        n = self.coords.shape[1]
+        if len(exps) > n:
+            return False
+        return rank_mod_p(evaluation_mod_p(self.coords, exps, self.p), self.p) == len(exps)
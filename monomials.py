@@ -0,0 +1,286 @@
+"""Exponent-tuple monomials shared by the vanishing-ideal backends.
+
+A monomial x₁^a₁ ⋯ xₙ^aₙ is represented by its exponent tuple (a₁, …, aₙ),
+or, for whole lists of monomials, by an (m, n) integer NumPy array with one
+row per monomial.  The helpers below enumerate, order and compare these
+without going through SymPy; conversion to SymPy expressions only happens
+when results are handed back to the caller.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import heapq
+from itertools import chain, combinations
+from math import comb
+
+import numpy as np
+
+
+def exp_divides(a, b):
+    """Return True if the exponent tuple a divides b."""
+    return all(i <= j for i, j in zip(a, b))
+
+def exponent_array(nvars: int, deg: int):
+    """Return the exponents of total degree ≤ deg as an (m, nvars) int64 array, increasing graded‑lex."""
+    return np.concatenate([exponents_of_degree(nvars, d) for d in range(deg + 1)])
+
+def exponents_of_degree(nvars: int, deg: int):
+    """
+    Return the exponents of total degree `deg` as an (m, nvars) int64 array, increasing lex.
+
+    The exponents are the compositions of deg into nvars parts, read off
+    the positions of nvars − 1 bars among deg + nvars − 1 slots (stars and
+    bars); the bar positions come out of itertools.combinations in
+    increasing lex order, and so do the exponents.
+    """
+    if nvars == 0:
+        return np.zeros((int(deg == 0), 0), dtype=np.int64)
+    slots = deg + nvars - 1
+    count = comb(slots, nvars - 1)
+    bars = np.fromiter(chain.from_iterable(combinations(range(slots), nvars - 1)),
+                       dtype=np.int64, count=count * (nvars - 1)).reshape(count, nvars - 1)
+    edges = np.column_stack([np.full(count, -1), bars, np.full(count, slots)])
+    return np.diff(edges, axis=1) - 1
+
+def next_layer(exps, ideal=None):
+    """
+    Return the distinct multiples x_i·e of the rows of `exps` (one degree up),
+    increasing lex, leaving out those in the MonomialIdeal `ideal`.
+    """
+    nvars = exps.shape[1]
+    layer = np.unique((exps[:, None, :] + np.eye(nvars, dtype=np.int64)).reshape(-1, nvars), axis=0)
+    if ideal is not None:
+        layer = layer[~ideal.contains_many(layer)]
+    return layer
+
+
+# ---------------------------------------------------------------------
+# Term orders
+# ---------------------------------------------------------------------
+class TermOrder:
+    """
+    A term order on exponent tuples (the first variable is the largest).
+
+    `key(exp)` sorts monomials increasingly and `sort_keys(E)` gives the
+    same order for the rows of an exponent array, as keys for np.lexsort.
+    `graded` is True when the order refines the total degree, which the
+    per-degree backends require.
+    """
+
+    def __init__(self, name, weights=None):
+        if name not in ("grlex", "grevlex", "lex", "weighted"):
+            raise ValueError(f"unknown term order {name!r}")
+        if name == "weighted":
+            if weights is None or any(w <= 0 for w in weights):
+                raise ValueError("a weighted order needs positive weights")
+            weights = tuple(weights)
+        self.name = name
+        self.weights = weights
+        self.graded = name in ("grlex", "grevlex")
+
+    def __repr__(self):
+        if self.name == "weighted":
+            return f"TermOrder('weighted', {self.weights})"
+        return f"TermOrder({self.name!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, TermOrder) and (self.name, self.weights) == (other.name, other.weights)
+
+    def __hash__(self):
+        return hash((self.name, self.weights))
+
+    def key(self, exp):
+        """Sort key of the exponent tuple `exp`."""
+        if self.name == "lex":
+            return tuple(exp)
+        if self.name == "grlex":
+            return (sum(exp), tuple(exp))
+        revlex = tuple(-e for e in reversed(exp))
+        if self.name == "grevlex":
+            return (sum(exp), revlex)
+        return (sum(w * e for w, e in zip(self.weights, exp)), sum(exp), revlex)
+
+    def sort_keys(self, E):
+        """Keys of the rows of E for np.lexsort (primary key last)."""
+        cols = [E[:, i] for i in range(E.shape[1])]
+        if self.name == "lex":
+            return cols[::-1]
+        if self.name == "grlex":
+            return cols[::-1] + [E.sum(axis=1)]
+        keys = [-c for c in cols] + [E.sum(axis=1)]
+        if self.name == "weighted":
+            keys.append(E @ np.asarray(self.weights, dtype=np.int64))
+        return keys
+
+    def sorted(self, exps):
+        """Return the exponent tuples `exps` in increasing order."""
+        return sorted(exps, key=self.key)
+
+    def argsort(self, E):
+        """Return the permutation sorting the rows of E increasingly."""
+        if not len(E):
+            return np.arange(0)
+        return np.lexsort(self.sort_keys(E))
+
+def term_order(order="grlex"):
+    """
+    Return the TermOrder described by `order`: a TermOrder, one of the
+    names "grlex", "grevlex", "lex", or ("weighted", weights).
+    """
+    if isinstance(order, TermOrder):
+        return order
+    if isinstance(order, str):
+        return TermOrder(order)
+    name, weights = order
+    return TermOrder(name, weights)
+
+
+# ---------------------------------------------------------------------
+# Monomial ideal index
+# ---------------------------------------------------------------------
+class MonomialIdeal:
+    """
+    Index of a monomial ideal given by its minimal generators.
+
+    Generators are stored in a trie keyed by one exponent per level, so
+    "is m in the ideal" only walks the branches whose exponents are ≤ the
+    corresponding exponents of m.  Two bounds answer most queries before
+    the trie is touched: the pure powers x_i^a among the generators (m is
+    in the ideal as soon as m_i ≥ a) and the smallest generator degree.
+    The complement of the ideal is the staircase of standard monomials.
+    """
+
+    def __init__(self, nvars: int, generators=()):
+        self.nvars = nvars
+        self._reset(generators)
+
+    def _reset(self, generators):
+        self.generators = []
+        self._trie = {}
+        self._pure = [None] * self.nvars
+        self._min_degree = None
+        for g in generators:
+            self.add(g)
+
+    def __len__(self):
+        return len(self.generators)
+
+    def __contains__(self, m):
+        return self.contains(m)
+
+    def add(self, g):
+        """Add the monomial g to the generators; return False if it was already in the ideal."""
+        g = tuple(int(k) for k in g)
+        if self.contains(g):
+            return False
+        if any(exp_divides(g, h) for h in self.generators):
+            # g makes some generators redundant: rebuild the index without them
+            keep = [h for h in self.generators if not exp_divides(g, h)]
+            self._reset(keep)
+        self.generators.append(g)
+        node = self._trie
+        for k in g:
+            node = node.setdefault(k, {})
+        support = [i for i, k in enumerate(g) if k]
+        if len(support) == 1:
+            i = support[0]
+            if self._pure[i] is None or g[i] < self._pure[i]:
+                self._pure[i] = g[i]
+        deg = sum(g)
+        if self._min_degree is None or deg < self._min_degree:
+            self._min_degree = deg
+        return True
+
+    def contains(self, m):
+        """Return True if the monomial m is divisible by some generator."""
+        if self._min_degree is None or sum(m) < self._min_degree:
+            return False
+        for i, a in enumerate(self._pure):
+            if a is not None and m[i] >= a:
+                return True
+        stack = [(self._trie, 0)]
+        while stack:
+            node, i = stack.pop()
+            if i == self.nvars:
+                return True
+            mi = m[i]
+            for k, child in node.items():
+                if k <= mi:
+                    stack.append((child, i + 1))
+        return False
+
+    def contains_many(self, E):
+        """Return a boolean mask of the rows of the exponent array E lying in the ideal."""
+        E = np.asarray(E, dtype=np.int64).reshape(-1, self.nvars)
+        out = np.zeros(len(E), dtype=bool)
+        if self._min_degree is None:
+            return out
+        for i, a in enumerate(self._pure):
+            if a is not None:
+                out |= E[:, i] >= a
+        rows = np.flatnonzero(~out & (E.sum(axis=1) >= self._min_degree))
+        out[self._batch(self._trie, E, rows, 0)] = True
+        return out
+
+    def _batch(self, node, E, rows, i):
+        if i == self.nvars or not rows.size:
+            return rows
+        hits = [self._batch(child, E, rows[E[rows, i] >= k], i + 1)
+                for k, child in node.items()]
+        return np.unique(np.concatenate(hits)) if hits else rows[:0]
+
+
+# ---------------------------------------------------------------------
+# Border traversal
+# ---------------------------------------------------------------------
+class Border:
+    """
+    Candidate monomials for Buchberger–Möller, visited in increasing order.
+
+    Iterating yields the smallest pending candidate that is not a multiple
+    of a leading term.  The caller then reports it with :meth:`standard`,
+    which queues its multiples x_i·t, or with :meth:`lead`, which adds it
+    to :attr:`ideal`.
+    """
+
+    def __init__(self, nvars: int, order):
+        self.order = term_order(order)
+        self.ideal = MonomialIdeal(nvars)
+        self.nvars = nvars
+        start = (0,) * nvars
+        self._heap = [(self.order.key(start), start)]
+        self._seen = {start}
+
+    def __iter__(self):
+        while self._heap:
+            _, t = heapq.heappop(self._heap)
+            if t not in self.ideal:
+                yield t
+
+    def standard(self, t):
+        for i in range(self.nvars):
+            m = t[:i] + (t[i] + 1,) + t[i + 1:]
+            if m not in self._seen:
+                self._seen.add(m)
+                heapq.heappush(self._heap, (self.order.key(m), m))
+
+    def lead(self, t):
+        self.ideal.add(t)
+
+def degree_groups(standard, generators):
+    """
+    Group a finished computation by degree.
+
+    Return [(d, standard_d, generators_d), …] for d = 0 … top degree, where
+    generators are (lead, terms) pairs placed by the largest total degree
+    of their terms.
+    """
+    groups = {}
+    for t in standard:
+        groups.setdefault(sum(t), ([], []))[0].append(t)
+    for lt, terms in generators:
+        d = max([sum(lt)] + [sum(e) for e, _ in terms])
+        groups.setdefault(d, ([], []))[1].append((lt, terms))
+    top = max(groups, default=-1)
+    return [(d,) + groups.get(d, ([], [])) for d in range(top + 1)]
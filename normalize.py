@@ -0,0 +1,66 @@
+"""Affine normalization of point sets.
+
+Points far from the origin or spread over a large range give evaluation
+matrices with badly scaled columns and Gröbner bases with huge
+coefficients.  The points are therefore moved to
+
+    y = (x − c) / s
+
+where c is their centroid and s the largest coordinate distance to it, so
+that they lie in [−1, 1]ⁿ.  For exact points c and s are rationals and the
+map is exact; for the numeric backend they are floats.
+
+Translating a monomial only adds its divisors, and a common scale factor
+only rescales coefficients, so the leading terms and standard monomials of
+the ideal are the same in both coordinate systems, for every term order.
+A generator g(y) of the normalized ideal becomes g((x − c)/s), divided by
+its new leading coefficient, which is again a reduced Gröbner basis
+element.  Translated or rescaled copies of a configuration have the same
+normalized points and so share cache entries.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+from fractions import Fraction
+from math import comb
+
+
+def normalization(pts, exact=True):
+    """
+    Return (center, scale, moved): the centroid, the scale and the points
+    mapped to (x − center) / scale.  `pts` are tuples of Fractions when
+    `exact`, of floats otherwise.
+    """
+    n, nvars = len(pts), len(pts[0])
+    center = tuple(sum(p[i] for p in pts) / n for i in range(nvars))
+    scale = max(abs(p[i] - center[i]) for p in pts for i in range(nvars))
+    if not scale:
+        scale = Fraction(1) if exact else 1.0
+    moved = [tuple((p[i] - center[i]) / scale for i in range(nvars)) for p in pts]
+    return center, scale, moved
+
+def _shifted_power(c, s, k):
+    """Coefficients of ((x − c)/s)^k, by power of x."""
+    return {j: comb(k, j) * (-c) ** (k - j) / s ** k for j in range(k + 1)}
+
+def map_back(terms, lead, center, scale):
+    """
+    Return the polynomial {exponent: coeff} g((x − center)/scale), made
+    monic at `lead`, for the normalized polynomial g given by `terms`.
+    With `lead` None the coefficients are left as they are.
+    """
+    powers = {}
+    out = {}
+    for e, coeff in terms.items():
+        partial = {(): coeff}
+        for i, k in enumerate(e):
+            key = (i, k)
+            if key not in powers:
+                powers[key] = _shifted_power(center[i], scale, k)
+            partial = {m + (j,): a * b for m, a in partial.items()
+                       for j, b in powers[key].items()}
+        for m, a in partial.items():
+            out[m] = out.get(m, 0) + a
+    top = 1 if lead is None else out[lead]
+    return {m: a / top for m, a in out.items() if a}
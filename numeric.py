@@ -0,0 +1,377 @@
+"""Floating-point backend for the vanishing-ideal engine.
+
+The evaluation matrix is built as a float64 NumPy array from power tables
+(see evaluation.py) and its kernel is
+extracted numerically, either by a full SVD or by first compressing the
+matrix to its m × m triangular factor with a QR decomposition and taking
+the SVD of that small factor (cheaper when there are many more points than
+monomials).  Singular values below ``tol`` times the largest one are
+treated as zero.
+
+In incremental mode the matrix is never rebuilt: the columns of degree d
+are formed as coordinate multiples of the standard columns of degree d − 1,
+projected against an orthonormal basis of the earlier standard columns,
+and only that new block is factorized; its standard columns then extend
+the basis.  The total work is proportional to the final matrix instead of
+the sum of all per-degree matrices.
+
+For point clouds too large for memory, :func:`streaming_numeric_polynomials`
+reads the points in chunks (typically from a memory-mapped .npy file) and
+only keeps, per degree, the m × m triangular factor of a running QR of the
+evaluation matrix (TSQR) or its Gram matrix MᵀM, so the memory used is
+O(m²) whatever the number of points.  With many more points than
+monomials it can instead sum random row sketches S·M of O(m) rows
+(Gaussian, or a block subsampled randomized Hadamard transform), whose
+kernel is that of M with high probability; the polynomials found are then
+checked on the full data, and a degree that fails is recomputed by QR.
+
+Kernel vectors are returned as coefficient arrays aligned with the list of
+monomials, in reduced echelon form with respect to the chosen graded term
+order (grlex or grevlex) so that every vanishing polynomial has a distinct
+leading monomial.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import numpy as np
+
+from evaluation import SharedEvaluator, evaluation_matrix, point_array, power_tables
+from monomials import MonomialIdeal, exponents_of_degree, next_layer, term_order
+
+
+def kernel(M, tol=1e-9, method="svd"):
+    """
+    Return an orthonormal basis of the numerical kernel of M, one vector per row.
+
+    `method` is "svd" (SVD of M) or "qr" (QR of M, then SVD of the m × m
+    factor R).
+    """
+    m = M.shape[1]
+    if method == "qr" and M.shape[0] > m:
+        M = np.linalg.qr(M, mode="r")
+    elif method not in ("svd", "qr"):
+        raise ValueError(f"unknown kernel method {method!r}")
+    # Vt is m × m either way; avoid building the n × n factor U for tall M
+    _, s, Vt = np.linalg.svd(M, full_matrices=M.shape[0] < m)
+    if s.size == 0 or s[0] == 0:
+        return Vt
+    rank = int(np.count_nonzero(s > tol * s[0]))
+    return Vt[rank:]
+
+def echelon_kernel(K, tol=1e-9):
+    """
+    Bring the kernel basis K to reduced echelon form from the last column.
+
+    Return (pivots, rows) where rows[i] has a 1 in column pivots[i], zeros in
+    the other pivot columns and (numerically) zeros after its pivot, so the
+    pivot is the leading monomial of the corresponding polynomial.
+    """
+    K = np.array(K, dtype=float)
+    pivots = []
+    r = 0
+    for col in range(K.shape[1] - 1, -1, -1):
+        if r == K.shape[0]:
+            break
+        i = r + int(np.argmax(np.abs(K[r:, col])))
+        if abs(K[i, col]) <= tol:
+            K[r:, col] = 0.0
+            continue
+        K[[r, i]] = K[[i, r]]
+        K[r] /= K[r, col]
+        others = np.arange(K.shape[0]) != r
+        K[others] -= np.outer(K[others, col], K[r])
+        pivots.append(col)
+        r += 1
+    K = K[:r]
+    K[np.abs(K) <= tol] = 0.0
+    return pivots, K
+
+def numeric_polynomials(pts, max_degree, tol=1e-9, method="svd", order="grlex", workers=None):
+    """
+    Yield (d, exps, coeffs) degree by degree, where exps is the (m, nvars)
+    array of exponents of degree ≤ d not divisible by an earlier leading
+    monomial, in increasing graded `order`, and coeffs is a (k, m) array of
+    vanishing polynomials.
+    Stop after `max_degree` or once a degree adds no standard monomial.
+
+    With `workers` the evaluation matrices are built in that many
+    processes (see evaluation.SharedEvaluator) and the kernel is read
+    straight from the shared buffer.
+    """
+    if workers:
+        with SharedEvaluator(point_array(pts), workers) as ev:
+            yield from _numeric_polynomials(pts, max_degree, tol, method, order, ev)
+    else:
+        yield from _numeric_polynomials(pts, max_degree, tol, method, order)
+
+def _numeric_polynomials(pts, max_degree, tol, method, order, ev=None):
+    order = term_order(order)
+    P = point_array(pts)
+    nvars = P.shape[1]
+    lead = MonomialIdeal(nvars)
+    tables = None
+    std = np.empty((0, nvars), dtype=np.int64)
+    layer = exponents_of_degree(nvars, 0)
+    for d in range(max_degree + 1):
+        exps = np.vstack([std, layer])
+        exps = exps[order.argsort(exps)]
+        if ev is None:
+            tables = power_tables(P, d, tables)
+            K = kernel(evaluation_matrix(P, exps, tables), tol, method)
+        else:
+            K = ev.apply(exps, lambda M: kernel(M, tol, method))
+        pivots, coeffs = echelon_kernel(K, tol)
+        for j in pivots:
+            lead.add(exps[j])
+        yield d, exps, coeffs
+        # the staircase is closed once degree d adds no standard monomial
+        if len(layer) == len(pivots):
+            return
+        layer = layer[~lead.contains_many(layer)]
+        std = np.vstack([std, layer])
+        layer = next_layer(layer, lead)
+
+def layer_columns(P, layer, prev_exps, prev_cols):
+    """
+    Return the (n, m) evaluation columns of the monomials `layer` at P.
+
+    Every monomial of a layer of degree d ≥ 1 is x_i times a standard
+    monomial of degree d − 1, a row of prev_exps whose column is in
+    prev_cols; the degree-0 layer is the constant column.
+    """
+    n, m = len(P), len(layer)
+    if not layer.any():
+        return np.ones((n, m))
+    index = {tuple(e): k for k, e in enumerate(prev_exps.tolist())}
+    var = np.argmax(layer > 0, axis=1)
+    parents = layer.copy()
+    parents[np.arange(m), var] -= 1
+    return prev_cols[:, [index[tuple(e)] for e in parents.tolist()]] * P[:, var]
+
+def project_out(Q, C):
+    """
+    Return (H, Cr): the coordinates H = QᵀC of the columns C on the
+    orthonormal columns Q and the residual Cr = C − Q·H, projected twice
+    for stability.
+    """
+    H = Q.T @ C
+    Cr = C - Q @ H
+    H2 = Q.T @ Cr
+    Cr -= Q @ H2
+    return H + H2, Cr
+
+def incremental_numeric_polynomials(pts, max_degree, tol=1e-9, order="grlex"):
+    """
+    Same stream as :func:`numeric_polynomials`, computed incrementally.
+
+    A thin QR factorization Q·R of the evaluation columns of the standard
+    monomials found so far is kept.  At degree d only the new layer of
+    columns is projected on the complement of Q; its numerical kernel
+    (singular values below ``tol`` times the largest column norm seen)
+    gives the new vanishing polynomials, whose lower-degree part is
+    recovered by a triangular solve with R.
+    """
+    order = term_order(order)
+    P = point_array(pts)
+    n, nvars = P.shape
+    lead = MonomialIdeal(nvars)
+    Q, R = np.empty((n, 0)), np.empty((0, 0))
+    std = np.empty((0, nvars), dtype=np.int64)
+    prev_exps, prev_cols = std, np.empty((n, 0))
+    scale = 0.0
+    for d in range(max_degree + 1):
+        layer = exponents_of_degree(nvars, 0) if d == 0 else next_layer(prev_exps, lead)
+        layer = layer[order.argsort(layer)]
+        m = len(layer)
+        C = layer_columns(P, layer, prev_exps, prev_cols)
+        scale = max(scale, float(np.linalg.norm(C, axis=0).max(initial=0.0)))
+        H, Cr = project_out(Q, C)
+        _, s, Vt = np.linalg.svd(Cr, full_matrices=n < m)
+        rank = int(np.count_nonzero(s > tol * scale))
+        pivots, B = echelon_kernel(Vt[rank:], tol)
+        # lower-degree part a of each kernel vector b: R·a = -H·b
+        A = -np.linalg.solve(R, H @ B.T).T if len(std) else np.empty((len(B), 0))
+        A[np.abs(A) <= tol] = 0.0
+        yield d, np.vstack([std, layer]), np.hstack([A, B])
+
+        for j in pivots:
+            lead.add(layer[j])
+        keep = np.setdiff1d(np.arange(m), pivots)
+        Qn, Rn = np.linalg.qr(Cr[:, keep])
+        R = np.block([[R, H[:, keep]], [np.zeros((len(keep), len(std))), Rn]])
+        Q = np.hstack([Q, Qn])
+        std = np.vstack([std, layer[keep]])
+        prev_exps, prev_cols = layer[keep], C[:, keep]
+        if not len(keep):
+            return
+
+
+# ---------------------------------------------------------------------
+# Out-of-core streaming
+# ---------------------------------------------------------------------
+SKETCHES = ("gaussian", "srht")
+
+def _chunks(P, chunk, center=None, scale=None):
+    """Yield the rows of P `chunk` at a time as float arrays, mapped to (x − center) / scale."""
+    for start in range(0, len(P), chunk):
+        X = np.asarray(P[start:start + chunk], dtype=float)
+        yield X if center is None else (X - center) / scale
+
+def stream_normalization(P, chunk=65536):
+    """Return the centroid and the largest coordinate distance to it of P, in two passes."""
+    n = len(P)
+    total = np.zeros(P.shape[1])
+    for X in _chunks(P, chunk):
+        total += X.sum(axis=0)
+    center = total / n
+    scale = 0.0
+    for X in _chunks(P, chunk):
+        scale = max(scale, float(np.abs(X - center).max()))
+    return center, scale or 1.0
+
+def _sylvester(k):
+    """The 2^k × 2^k Walsh–Hadamard matrix."""
+    H = np.ones((1, 1))
+    for _ in range(k):
+        H = np.block([[H, H], [H, -H]])
+    return H
+
+def hadamard(X):
+    """
+    Return H·X_k for every block X_k = X[k] of a (nb, b, m) array, H being
+    the (unnormalized) b × b Walsh–Hadamard matrix, b a power of two.
+
+    H = H_A ⊗ H_C with A·C = b and A, C ≈ √b, so the transform is two
+    batched products with small dense matrices.
+    """
+    nb, b, m = X.shape
+    k = b.bit_length() - 1
+    A, C = 1 << (k // 2), 1 << (k - k // 2)
+    Y = _sylvester(k // 2) @ X.reshape(nb, A, C * m)
+    Y = _sylvester(k - k // 2) @ Y.reshape(nb * A, C, m)
+    return Y.reshape(nb, b, m)
+
+def sketch(E, size, kind, rng):
+    """
+    Return S·E for a random size × len(E) sketching matrix S with E[SᵀS] = I.
+
+    Kind "gaussian" draws S with independent normal entries.  Kind "srht"
+    is a block subsampled randomized Hadamard transform: the rows of E get
+    random signs and are cut into blocks of at least 2·`size` rows; each
+    block goes through a Walsh–Hadamard transform, `size` of its rows are
+    sampled, and the samples of all blocks are summed.  It costs
+    O(len(E)·m·√size) in BLAS products instead of O(len(E)·m·size).
+    """
+    n, m = E.shape
+    if kind == "gaussian":
+        return rng.standard_normal((size, n)) @ E / np.sqrt(size)
+    b = 1 << max(2 * size - 1, 0).bit_length()
+    nb = -(-n // b)
+    X = np.zeros((nb * b, m))
+    X[:n] = E * rng.choice((-1.0, 1.0), n)[:, None]
+    X = hadamard(X.reshape(nb, b, m))
+    rows = rng.integers(0, b, (nb, size))
+    return X[np.arange(nb)[:, None], rows].sum(axis=0) / np.sqrt(size)
+
+def accumulate(P, exps, method="qr", chunk=65536, center=None, scale=None, rng=None):
+    """
+    Return a small factor of the evaluation matrix M of `exps` at the rows
+    of P, read `chunk` rows at a time: R of its QR decomposition (method
+    "qr", stacking each chunk under the running R), the Gram matrix MᵀM
+    (method "gram", cheaper but squaring the condition number) or a
+    random sketch S·M with 2m + 8 rows (method "gaussian" or "srht", summed
+    over the chunks; see :func:`sketch`), which has the same kernel as M
+    with high probability.
+    With `center` and `scale` the rows are mapped to (x − center) / scale.
+    """
+    m = len(exps)
+    if method == "gram":
+        acc = np.zeros((m, m))
+    elif method in SKETCHES:
+        acc = np.zeros((2 * m + 8, m))
+        rng = np.random.default_rng() if rng is None else rng
+    else:
+        acc = np.zeros((0, m))
+    for X in _chunks(P, chunk, center, scale):
+        E = evaluation_matrix(X, exps)
+        if method == "gram":
+            acc += E.T @ E
+        elif method in SKETCHES:
+            acc += sketch(E, len(acc), method, rng)
+        else:
+            acc = np.linalg.qr(np.vstack([acc, E]), mode="r")
+    return acc
+
+def factor_kernel(F, tol=1e-9, method="qr"):
+    """Orthonormal kernel basis, one vector per row, from an accumulated factor."""
+    if method == "gram":
+        # eigenvalues of MᵀM are squared singular values, known only up to
+        # rounding of the largest one: compare them on that scale
+        w, V = np.linalg.eigh(F)
+        s, Vt = np.clip(w[::-1], 0.0, None), V[:, ::-1].T
+        tol = max(tol ** 2, len(s) * np.finfo(float).eps)
+    elif method == "qr" or method in SKETCHES:
+        _, s, Vt = np.linalg.svd(F, full_matrices=True)
+    else:
+        raise ValueError(f"unknown accumulation method {method!r}")
+    if s.size == 0 or s[0] == 0:
+        return Vt
+    rank = int(np.count_nonzero(s > tol * s[0]))
+    return Vt[rank:]
+
+def residual_check(P, exps, coeffs, bound, chunk=65536, center=None, scale=None):
+    """
+    Return True if every row c of coeffs has ‖M·c‖ ≤ bound·‖c‖ on the full
+    evaluation matrix M of `exps` at P, in one pass over the chunks.
+    """
+    if not len(coeffs):
+        return True
+    total = np.zeros(len(coeffs))
+    for X in _chunks(P, chunk, center, scale):
+        total += ((evaluation_matrix(X, exps) @ coeffs.T) ** 2).sum(axis=0)
+    return bool(np.all(np.sqrt(total) <= bound * np.linalg.norm(coeffs, axis=1)))
+
+def streaming_numeric_polynomials(P, max_degree, tol=1e-9, method="qr", order="grlex",
+                                  chunk=65536, center=None, scale=None, check=1e-6, seed=None):
+    """
+    Same stream as :func:`numeric_polynomials` for an (n, nvars) array P
+    that is only read `chunk` rows at a time, once per degree (see
+    :func:`accumulate` for `method`, `center` and `scale`).
+
+    With a sketch method the polynomials read from the sketch are checked
+    on the full data in a second pass: if one of them is larger than
+    `check` times the largest singular value of the sketch, the degree is
+    recomputed with method "qr".  `seed` seeds the random sketches.
+    """
+    order = term_order(order)
+    P = P if isinstance(P, np.ndarray) else point_array(P)
+    rng = np.random.default_rng(seed)
+    nvars = P.shape[1]
+    lead = MonomialIdeal(nvars)
+    std = np.empty((0, nvars), dtype=np.int64)
+    layer = exponents_of_degree(nvars, 0)
+    for d in range(max_degree + 1):
+        exps = np.vstack([std, layer])
+        exps = exps[order.argsort(exps)]
+        F = accumulate(P, exps, method, chunk, center, scale, rng)
+        pivots, coeffs = echelon_kernel(factor_kernel(F, tol, method), tol)
+        # the columns below degree d are standard: a pivot there means the
+        # sketch lost rank that the earlier degrees did not
+        in_layer = exps[pivots].sum(axis=1) == d if pivots else np.ones(0, dtype=bool)
+        if method in SKETCHES and not (in_layer.all() and residual_check(
+                P, exps, coeffs, check * np.linalg.norm(F, 2), chunk, center, scale)):
+            F = accumulate(P, exps, "qr", chunk, center, scale)
+            pivots, coeffs = echelon_kernel(factor_kernel(F, tol, "qr"), tol)
+            in_layer = exps[pivots].sum(axis=1) == d if pivots else np.ones(0, dtype=bool)
+        # a vector that still leads with a standard monomial is rounding noise
+        pivots, coeffs = [j for j, keep in zip(pivots, in_layer) if keep], coeffs[in_layer]
+        for j in pivots:
+            lead.add(exps[j])
+        yield d, exps, coeffs
+        layer = layer[~lead.contains_many(layer)]
+        # the staircase is closed once degree d adds no standard monomial
+        if not len(layer):
+            return
+        std = np.vstack([std, layer])
+        layer = next_layer(layer, lead)
@@ -0,0 +1,165 @@
+"""Point updates of a computed vanishing ideal.
+
+A reduced Gröbner basis G of the ideal of a point set X, together with its
+standard monomials S, is enough to obtain the ideal of X ∪ {p} without
+starting over:
+
+1. evaluate every generator at p; if they all vanish, p is already in X;
+2. otherwise the smallest leading term t whose generator g_t does not
+   vanish at p becomes a standard monomial, and g_t / g_t(p) is the
+   separator of p (it vanishes on X and is 1 at p);
+3. every other generator g with g(p) ≠ 0 is replaced by
+   g − g(p)/g_t(p) · g_t, which keeps its leading term;
+4. each x_i·t that is not a multiple of another leading term is a new
+   leading term, with generator (x_i − p_i)·g_t reduced to normal form.
+
+Steps 1–3 cost O(n·|G|) operations on the sparse polynomials.
+
+Removing a point goes the other way through the separators (the dual basis
+of the standard monomials): the separator of the leaving point vanishes on
+all the others, so it is added to the ideal and its largest monomial
+leaves the staircase (see :func:`delete_point`).
+
+Polynomials are dicts {exponent tuple: Fraction}, generators including
+their leading term with coefficient 1.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+from fractions import Fraction
+
+from sympy import QQ
+from sympy.polys.matrices import DomainMatrix
+
+from evaluation import evaluation_matrix, point_array
+from monomials import MonomialIdeal, exp_divides
+
+
+def evaluate(poly, p, values=None):
+    """
+    Return the value of the sparse polynomial `poly` at the point `p`.
+
+    `values` caches monomial values at p between calls.
+    """
+    values = {} if values is None else values
+    return sum(c * _monomial_value(e, p, values) for e, c in poly.items())
+
+def _monomial_value(e, p, values):
+    v = values.get(e)
+    if v is None:
+        v = 1
+        for c, k in zip(p, e):
+            v *= c ** k
+        values[e] = v
+    return v
+
+def _axpy(f, a, g):
+    """Return f + a·g without zero terms."""
+    h = dict(f)
+    for e, c in g.items():
+        h[e] = h.get(e, 0) + a * c
+        if not h[e]:
+            del h[e]
+    return h
+
+def _reduce_tail(h, lead, standard, generators, order):
+    """Reduce every term of h below `lead` until it only involves standard monomials."""
+    while True:
+        rest = [e for e in h if e != lead and e not in standard]
+        if not rest:
+            return h
+        e = max(rest, key=order.key)
+        lt = next(lt for lt in generators if exp_divides(lt, e))
+        shift = tuple(a - b for a, b in zip(e, lt))
+        c = h[e]
+        for f, cf in generators[lt].items():
+            m = tuple(a + b for a, b in zip(f, shift))
+            h[m] = h.get(m, 0) - c * cf
+            if not h[m]:
+                del h[m]
+
+def insert_point(standard, generators, p, order):
+    """
+    Update the ideal of a point set for the new point `p`.
+
+    `standard` is the set of standard monomials and `generators` maps each
+    leading term to its generator.  Return (t, changed, separator): the new
+    standard monomial, the generators that changed or appeared (keyed by
+    leading term; t itself is no longer one) and the separator of p.
+    Return (None, {}, None) if every generator vanishes at p.
+    """
+    values = {}
+    at_p = {lt: evaluate(g, p, values) for lt, g in generators.items()}
+    moved = [lt for lt, v in at_p.items() if v]
+    if not moved:
+        return None, {}, None
+    t = min(moved, key=order.key)
+    gt = generators[t]
+    separator = {e: c / at_p[t] for e, c in gt.items()}
+
+    changed = {lt: _axpy(generators[lt], -at_p[lt], separator) for lt in moved if lt != t}
+    new_standard = set(standard) | {t}
+    others = [lt for lt in generators if lt != t]
+    ideal = MonomialIdeal(len(t), others)
+    corners = []
+    for i in range(len(t)):
+        u = t[:i] + (t[i] + 1,) + t[i + 1:]
+        if u not in ideal:
+            corners.append((u, i))
+    current = {lt: changed.get(lt, generators[lt]) for lt in others}
+    for u, i in sorted(corners, key=lambda c: order.key(c[0])):
+        h = {}
+        for e, c in gt.items():
+            m = e[:i] + (e[i] + 1,) + e[i + 1:]
+            h[m] = h.get(m, 0) + c
+            h[e] = h.get(e, 0) - p[i] * c
+        h = {e: c for e, c in h.items() if c}
+        h = _reduce_tail(h, u, new_standard, current, order)
+        current[u] = changed[u] = h
+    return t, changed, separator
+
+def delete_point(generators, separators, j, order):
+    """
+    Update the ideal of a point set when its j-th point leaves.
+
+    `separators` lists the separator of every point.  The separator f of
+    the leaving point vanishes on all the others, so it joins the ideal:
+    its largest monomial s stops being standard, f / f[s] becomes the
+    generator with leading term s, the other generators lose their s term,
+    and those whose leading term is a multiple of s are no longer needed.
+    Return (s, changed, dropped, separators): the removed standard
+    monomial, the generators that changed or appeared, the leading terms
+    that were dropped and the separators of the remaining points.
+    """
+    f = separators[j]
+    s = max(f, key=order.key)
+    h = {e: c / f[s] for e, c in f.items()}
+    dropped = [lt for lt in generators if exp_divides(s, lt)]
+    changed = {lt: _axpy(g, -g[s], h) for lt, g in generators.items()
+               if s in g and lt not in dropped}
+    changed[s] = h
+    rest = [_axpy(g, -g[s], h) if s in g else g
+            for k, g in enumerate(separators) if k != j]
+    return s, changed, dropped, rest
+
+def update_separators(separators, p, separator):
+    """Make the separators of the old points vanish at the new point p."""
+    values = {}
+    return [_axpy(f, -evaluate(f, p, values), separator) for f in separators] + [separator]
+
+def separators(points, standard):
+    """
+    Return the separator of each point as a polynomial over `standard`.
+
+    The separator of points[j] is 1 at points[j] and 0 at the other points;
+    the coefficients are the columns of the inverse of the evaluation
+    matrix of the standard monomials.
+    """
+    n = len(points)
+    V = evaluation_matrix(point_array(points, exact=True), standard)
+    rows = [[QQ(c.numerator, c.denominator) for c in row] for row in V.tolist()]
+    inv = DomainMatrix(rows, (n, n), QQ).inv().to_list()
+    return [{e: Fraction(int(inv[k][j].numerator), int(inv[k][j].denominator))
+             for k, e in enumerate(standard) if inv[k][j]}
+            for j in range(n)]
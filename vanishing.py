@@ -0,0 +1,942 @@
+"""Shared vanishing-ideal engine used by poly.py, 2D.py and 3poly.py.
+
+Several backends compute the ideal of a finite point set:
+
+* ``"bm"`` (default) -- a Buchberger–Möller engine.  Monomials are
+  processed one at a time in increasing term order.  The evaluation
+  vector of each candidate is reduced against an incrementally maintained
+  echelon basis of the evaluation vectors of the standard monomials found
+  so far.  A vector that reduces to zero gives a Gröbner basis element,
+  otherwise the monomial joins the staircase.  Each monomial costs
+  O(n·|staircase|) and the whole ideal comes out in a single pass.
+* ``"modular"`` -- the same algorithm run over several word-size prime
+  fields and lifted back to ℚ by Chinese remaindering and rational
+  reconstruction (see modular.py).  Avoids coefficient blow-up during
+  elimination on integer and rational point sets.
+* ``"divide"`` -- divide and conquer: the ideals of shards of the points
+  are computed in worker processes and merged pairwise up a tree through
+  their separators (see merge.py).
+* ``"sympy"`` -- the original procedure: for every degree d, rebuild the
+  evaluation matrix of all non-filtered monomials of degree ≤ d and take
+  its exact null-space with ``sp.Matrix.nullspace``.
+* ``"domain"`` -- the same per-degree procedure on an integer
+  ``DomainMatrix`` with fraction-free elimination (see exact.py), so no
+  generic symbolic arithmetic is involved.
+* ``"numeric"`` -- the same per-degree procedure in float64 with NumPy,
+  the kernel being read from an SVD (see numeric.py).  Meant for large
+  sets of floating-point points.
+* ``"stream"`` -- the numeric procedure for point arrays that do not fit
+  in memory (e.g. a memory-mapped .npy file): the points are read in
+  chunks and only an m × m factor, or a random sketch with O(m) rows, of
+  the evaluation matrix is kept.
+* ``"approximate"`` -- the Approximate Buchberger–Möller algorithm for
+  noisy points: polynomials whose values at the points have an RMS below
+  a tolerance ``eps`` count as vanishing (see approximate.py).
+
+All expose the same ``(degree, monos, polys)`` stream through
+:func:`nullspace_polynomials`.  :func:`vanishing_ideal` runs the
+computation once and returns a :class:`VanishingIdeal` holding the
+per-degree standard monomials, generators, leading terms and timings.
+
+Author: Yudi Sun && Long Qian
+Encadrant: Jérémy Berthomieu
+"""
+
+import re
+import time
+from collections import deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from fractions import Fraction
+
+import numpy as np
+import sympy as sp
+from sympy.core.mul import _keep_coeff
+
+from approximate import approximate_polynomials
+from cache import ResultCache, point_set_key
+from evaluation import evaluation_matrix, point_array, power_tables, to_fraction, values_from_parent
+from exact import domain_polynomials
+from merge import Shard, divide_and_conquer
+from monomials import (Border, MonomialIdeal, degree_groups, exponent_array,
+                       exponents_of_degree, term_order)
+from modular import RankCheck, modular_buchberger_moller
+from normalize import map_back, normalization
+from numeric import (incremental_numeric_polynomials, numeric_polynomials,
+                     stream_normalization, streaming_numeric_polynomials)
+from update import delete_point, insert_point, separators, update_separators
+
+_EXP_RE = re.compile(r"\*\*([0-9]+)")
+
+def to_caret(expr):
+    """Convert a SymPy expression to a string with caret notation."""
+    return _EXP_RE.sub(r"^\1", str(expr))
+
+
+# ---------------------------------------------------------------------
+# Output conversion (exponent tuples -> SymPy)
+# ---------------------------------------------------------------------
+def default_symbols(nvars: int):
+    """Return the symbols x, y, z for up to three variables, x1, …, xn beyond."""
+    if nvars <= 3:
+        return sp.symbols("x y z")[:nvars]
+    return sp.symbols(f"x1:{nvars + 1}")
+
+def _to_monomial(symbols, exp):
+    return sp.Mul(*[s ** int(e) for s, e in zip(symbols, exp)])
+
+def _monomial_list(symbols, exps, cache):
+    """Convert exponent tuples or array rows to SymPy monomials, reusing `cache`."""
+    out = []
+    for e in exps:
+        e = tuple(int(k) for k in e)
+        if e not in cache:
+            cache[e] = _to_monomial(symbols, e)
+        out.append(cache[e])
+    return out
+
+def _to_poly(symbols, terms, cache):
+    """Build the expanded SymPy polynomial Σ c·m from exponent/coefficient pairs."""
+    monos = _monomial_list(symbols, [e for e, _ in terms], cache)
+    return sp.Add(*[sp.sympify(c) * m for (_, c), m in zip(terms, monos)])
+
+
+# ---------------------------------------------------------------------
+# Buchberger–Möller engine
+# ---------------------------------------------------------------------
+def buchberger_moller(pts, max_degree=None, order="grlex", separators_out=None):
+    """
+    Run the Buchberger–Möller algorithm over ℚ on the points `pts`.
+
+    Yield (d, standard, generators) for d = 0, 1, … where `standard` is
+    the list of standard monomials of degree d and `generators` is the list
+    of reduced Gröbner basis elements of degree d, each given as
+    (lead, [(exp, coeff), …]) meaning lead + Σ coeff·x^exp.  Monomials are
+    exponent tuples, visited in increasing `order` (see
+    monomials.term_order), so every generator's leading monomial is the
+    candidate that reduced to zero.  Iteration stops after `max_degree` or
+    as soon as the staircase closes, i.e. no candidate is left: then every
+    further monomial is a multiple of a leading term.
+
+    For a graded order degrees are yielded as soon as they are complete;
+    other orders visit degrees out of sequence and are yielded at the end.
+
+    If `separators_out` is a list and the staircase closes, the separator of
+    every distinct point (in order of first occurrence) is appended to it
+    at the end, as a dict {exp: coeff} over the standard monomials.  It
+    is read from the final echelon basis by back-substitution.
+    """
+    pts = [tuple(to_fraction(c) for c in p) for p in pts]
+    n = len(pts)
+    nvars = len(pts[0]) if pts else 0
+    coords = [[p[i] for p in pts] for i in range(nvars)]
+    border = Border(nvars, order)
+    graded = border.order.graded
+
+    values = {}  # standard monomial -> its evaluation vector
+    std = []
+    basis = []  # echelon rows (pivot, row, combination over `std`)
+    gens = []
+    done = 0  # number of degrees already yielded
+
+    for t in border:
+        if max_degree is not None and sum(t) > max_degree:
+            if graded:
+                break
+            continue
+        if graded and sum(t) > done:
+            groups = degree_groups(std, gens)
+            for d, std_d, gens_d in groups[done:sum(t)]:
+                yield d, std_d, gens_d
+            done = sum(t)
+        # t = x_i · s for some standard s, so its values follow in O(n)
+        v = values_from_parent(t, values, coords, n)
+        comb = [Fraction(0)] * len(std)
+        row = list(v)
+        for pivot, brow, bcomb in basis:
+            f = row[pivot]
+            if f:
+                for j in range(n):
+                    if brow[j]:
+                        row[j] -= f * brow[j]
+                for k, c in enumerate(bcomb):
+                    if c:
+                        comb[k] -= f * c
+        pivot = next((j for j in range(n) if row[j]), None)
+        if pivot is None:
+            border.lead(t)
+            gens.append((t, [(std[k], c) for k, c in enumerate(comb) if c]))
+            continue
+        inv = 1 / row[pivot]
+        row = [r * inv for r in row]
+        comb = [c * inv for c in comb] + [inv]
+        std.append(t)
+        values[t] = v
+        basis.append((pivot, row, comb))
+        border.standard(t)
+    if separators_out is not None and len(basis) == len(set(pts)):
+        separators_out.extend(_echelon_separators(basis, std))
+    for d, std_d, gens_d in degree_groups(std, gens)[done:]:
+        yield d, std_d, gens_d
+
+def _echelon_separators(basis, std):
+    """
+    Separators from a complete echelon basis: clearing every row at the
+    later pivots turns the rows into unit vectors on the pivot columns, and
+    their combinations into the separators of the pivot points.
+    """
+    zero = Fraction(0)
+    combs = [comb + [zero] * (len(std) - len(comb)) for _, _, comb in basis]
+    # row k is already 0 at the earlier pivots, and clearing later ones
+    # leaves its entry at pivot k unchanged, so f is read from the row as is
+    for k in range(len(basis) - 1, 0, -1):
+        pivot, ck = basis[k][0], combs[k]
+        for j in range(k):
+            f = basis[j][1][pivot]
+            if f:
+                combs[j] = [a - f * b if b else a for a, b in zip(combs[j], ck)]
+    ordered = sorted(range(len(basis)), key=lambda k: basis[k][0])
+    return [{std[i]: c for i, c in enumerate(combs[k]) if c} for k in ordered]
+
+
+# ---------------------------------------------------------------------
+# Per-degree steps
+# ---------------------------------------------------------------------
+# Every backend is turned into the same stream of steps
+# (d, monos, standard, leads, polys): the exponents of the columns used at
+# degree d, the new standard monomials of degree d, the leading monomial of
+# each new generator and the generators themselves, as lists of
+# (exponent, coefficient) pairs or, for the numeric backends, as coefficient
+# arrays aligned with monos.  The exact per-degree backends give polys = None
+# for a degree whose null-space the modular rank check showed to be empty.
+
+_ARRAY_BACKENDS = ("numeric", "stream", "approximate")
+
+def _steps(pts, max_degree, backend, order, options, separators_out=None):
+    if backend == "bm":
+        return _bm_steps(buchberger_moller(pts, max_degree, order, separators_out), order)
+    if backend == "modular":
+        return _bm_steps(modular_buchberger_moller(pts, max_degree, order, **options), order)
+    if backend == "divide":
+        return _bm_steps(_divide_steps(pts, max_degree, order, **options), order)
+    if backend not in ("sympy", "domain") + _ARRAY_BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}")
+    if not order.graded:
+        raise ValueError(f"the {backend} backend works degree by degree and "
+                         f"needs a graded order, not {order!r}")
+    if max_degree is None:
+        max_degree = len(pts)
+    if backend == "sympy":
+        return _sympy_steps(pts, max_degree, order, **options)
+    if backend == "domain":
+        return _domain_steps(pts, max_degree, order, **options)
+    if backend == "stream":
+        return _array_steps(streaming_numeric_polynomials(pts, max_degree, order=order, **options))
+    if backend == "approximate":
+        return _array_steps(approximate_polynomials(pts, max_degree, order=order, **options))
+    return _numeric_steps(pts, max_degree, order, **options)
+
+def _bm_steps(steps, order):
+    standard = []
+    for d, std_d, gens_d in steps:
+        leads = [lt for lt, _ in gens_d]
+        monos = order.sorted(standard + std_d + leads)
+        standard.extend(std_d)
+        polys = [[(lt, Fraction(1))] + terms for lt, terms in gens_d]
+        yield d, monos, std_d, leads, polys
+
+def _bm_shard(pts, order):
+    """A merge.Shard of the distinct points `pts` from Buchberger–Möller."""
+    std, gens, seps = [], {}, []
+    for _, std_d, gens_d in buchberger_moller(pts, order=order, separators_out=seps):
+        std.extend(std_d)
+        for lt, terms in gens_d:
+            gens[lt] = dict([(lt, Fraction(1))] + terms)
+    return Shard(list(pts), std, gens, seps)
+
+def _divide_steps(pts, max_degree, order, shards=None, workers=None):
+    shard = divide_and_conquer([tuple(to_fraction(c) for c in p) for p in pts],
+                               shards, workers, order, _bm_shard)
+    gens = [(lt, [(e, c) for e, c in shard.generators[lt].items() if e != lt])
+            for lt in order.sorted(shard.generators)]
+    groups = degree_groups(shard.standard, gens)
+    return groups if max_degree is None else groups[:max_degree + 1]
+
+def _sympy_steps(pts, max_degree, order, precheck=True):
+    P = point_array([[sp.sympify(c) for c in pt] for pt in pts], exact=True)
+    check = RankCheck([tuple(map(to_fraction, pt)) for pt in pts]) if precheck else None
+    nvars = P.shape[1]
+    tables = None
+    lead_terms = MonomialIdeal(nvars)
+    for d in range(max_degree + 1):
+        # filter out monomials divisible by any leading term
+        exps = exponent_array(nvars, d)
+        exps = exps[~lead_terms.contains_many(exps)]
+        exps = exps[order.argsort(exps)]
+        monos = [tuple(e) for e in exps.tolist()]
+        # build evaluation matrix from the power tables of the points
+        tables = power_tables(P, d, tables)
+        if check is not None and check.full_rank(exps):
+            # full column rank modulo a prime: the null-space is empty
+            polys, leads = None, []
+        else:
+            M = sp.Matrix(evaluation_matrix(P, exps, tables).tolist())
+            # columns are in increasing order, so each null-space vector is 1 at
+            # its free column and zero after it: that column is its leading term
+            polys = [[(m, c) for m, c in zip(monos, vec) if c] for vec in M.nullspace()]
+            leads = [terms[-1][0] for terms in polys]
+        for lt in leads:
+            lead_terms.add(lt)
+        layer = exponents_of_degree(nvars, d)
+        standard = [tuple(e) for e in layer[~lead_terms.contains_many(layer)].tolist()]
+        yield d, monos, standard, leads, polys
+        # stop once the staircase has no monomial of degree d
+        if not standard:
+            return
+
+def _domain_steps(pts, max_degree, order, precheck=True):
+    for d, exps, coeffs in domain_polynomials(pts, max_degree, order, precheck):
+        monos = [tuple(e) for e in exps.tolist()]
+        polys = None if coeffs is None else [[(m, c) for m, c in zip(monos, vec) if c]
+                                             for vec in coeffs]
+        leads = [terms[-1][0] for terms in polys or []]
+        standard = [m for m in monos if sum(m) == d and m not in leads]
+        yield d, monos, standard, leads, polys
+
+def _numeric_steps(pts, max_degree, order, tol=1e-9, method="svd", incremental=True,
+                   workers=None):
+    # the parallel builder fills whole matrices, which only the full mode uses
+    # (passing workers therefore selects it)
+    if incremental and not workers:
+        steps = incremental_numeric_polynomials(pts, max_degree, tol, order)
+    else:
+        steps = numeric_polynomials(pts, max_degree, tol, method, order, workers)
+    return _array_steps(steps)
+
+def _array_steps(steps):
+    for d, exps, coeffs in steps:
+        monos = [tuple(e) for e in exps.tolist()]
+        # rows are in echelon form: the pivot is the last nonzero entry
+        leads = [monos[np.flatnonzero(row)[-1]] for row in coeffs]
+        standard = [m for m in monos if sum(m) == d and m not in leads]
+        yield d, monos, standard, leads, list(coeffs)
+
+
+# ---------------------------------------------------------------------
+# Degree-by-degree stream
+# ---------------------------------------------------------------------
+def nullspace_polynomials(pts, symbols=None, max_degree=None, backend="bm", order="grlex",
+                          cache=None, normalize=False, **options):
+    """
+    Yield (degree, monos, [poly₁, …, poly_k]) where monos is
+    the filtered list of standard monomials of degree ≤ d,
+    and the list is a SymPy basis of the null‑space of
+    the evaluation matrix for those monomials.
+
+    The points may have any number of coordinates; `symbols` names the
+    variables and defaults to :func:`default_symbols`.
+
+    The stream ends at the regularity degree, once a degree contributes no
+    new standard monomial (the staircase then holds one monomial per
+    distinct point and its whole border is accounted for).  `max_degree`
+    is an optional upper bound; it defaults to len(pts), which is never
+    reached.
+
+    `backend` selects the engine: "bm" (Buchberger–Möller), "modular"
+    (Buchberger–Möller modulo primes lifted to ℚ, see modular.py; accepts
+    `nprimes`), "divide" (shard ideals merged up a tree, see merge.py;
+    accepts `shards` and `workers`), "sympy" (per-degree exact
+    null-space), "domain" (the same on an integer DomainMatrix, see
+    exact.py; both skip the degrees whose matrix has full column rank
+    modulo a random prime unless `precheck` is False), "numeric"
+    (per-degree float64 null-space, see numeric.py; accepts `tol`,
+    `incremental` and, for the non-incremental mode, `method`; `workers`
+    builds each evaluation matrix in that many processes, in the
+    non-incremental mode),
+    "stream" (the numeric procedure reading `pts`, an array such as
+    np.load(path, mmap_mode="r"), `chunk` rows at a time; accepts `tol`,
+    `chunk`, `method`, "qr", "gram" or the random sketches "gaussian"
+    and "srht", and for those `check` and `seed`) or "approximate"
+    (Approximate Buchberger–Möller for noisy points, see approximate.py;
+    accepts `eps`, the largest RMS value at the points of a polynomial
+    that counts as vanishing).
+
+    `order` is the term order (see monomials.term_order): "grlex",
+    "grevlex", "lex" or ("weighted", weights).  Leading terms, the
+    staircase and the column order of monos all follow it.  The per-degree
+    backends need a graded order (grlex or grevlex).
+    Polynomials are expanded; factored forms are a presentation matter
+    (see :class:`Generator`).  The numeric backends yield coefficient
+    arrays aligned with monos instead of SymPy expressions.
+
+    With a `cache` (a cache.ResultCache, or True for the default one under
+    ~/.cache/vanishing) the whole ideal is looked up first, or computed and
+    stored, and the stream is read from it.  The "stream" backend cannot
+    be cached.
+
+    With `normalize` the points are first moved to their centroid and
+    scaled into [−1, 1]ⁿ (exactly, or in float for the numeric backends, see
+    normalize.py); the polynomials are mapped back to the original
+    coordinates, which has the same leading terms and staircase.
+    """
+    if cache is not None or normalize:
+        yield from vanishing_ideal(pts, symbols, max_degree, backend, order, cache,
+                                   normalize, **options).by_degree()
+        return
+    memo = {}
+    order = term_order(order)
+    symbols = default_symbols(len(pts[0])) if symbols is None else symbols
+    for d, monos, _, _, polys in _steps(pts, max_degree, backend, order, options):
+        if backend not in _ARRAY_BACKENDS:
+            polys = [_to_poly(symbols, terms, memo) for terms in polys or []]
+        yield d, _monomial_list(symbols, monos, memo), polys
+
+def vanishing_ideal(pts, symbols=None, max_degree=None, backend="bm", order="grlex",
+                    cache=None, normalize=False, with_separators=False, **options):
+    """
+    Compute the vanishing ideal of `pts` once and return a VanishingIdeal.
+
+    Arguments are those of :func:`nullspace_polynomials`.  On a `cache`
+    hit the stored staircase and generators are returned, with the
+    timings of the computation that produced them.  With `normalize` the
+    ideal is computed (and cached) in normalized coordinates and each
+    generator is mapped back the first time its terms are needed; the
+    map is kept in the result's `transform`.
+
+    With `with_separators` the "bm" backend also reads the separators of
+    the points off its final echelon basis (see :func:`buchberger_moller`),
+    mapped back like the generators under `normalize`.
+    Otherwise they are computed on first use, by inverting the evaluation
+    matrix of the standard monomials.
+    """
+    steps = []
+    memo = {}
+    order = term_order(order)
+    symbols = default_symbols(len(pts[0])) if symbols is None else symbols
+    if cache is not None and backend == "stream":
+        # the key would need every point as a Python object, which the
+        # stream backend exists to avoid
+        raise ValueError("the stream backend does not support cache")
+    if normalize:
+        if backend == "stream":
+            # the points stay where they are; each chunk is moved as it is read
+            pts = pts if isinstance(pts, np.ndarray) else point_array(pts)
+            center, scale = stream_normalization(pts, options.get("chunk", 65536))
+            options = dict(options, center=center, scale=scale)
+            center, moved = tuple(map(float, center)), pts
+        elif backend in _ARRAY_BACKENDS:
+            center, scale, moved = normalization([tuple(map(float, p)) for p in pts], exact=False)
+        else:
+            center, scale, moved = normalization([tuple(map(to_fraction, p)) for p in pts])
+        ideal = vanishing_ideal(moved, symbols, max_degree, backend, order, cache,
+                                with_separators=with_separators, **options)
+        for g in ideal.generators:
+            g._transform = (center, scale)
+        if ideal._separators is not None:
+            # the moved points keep their order, so separator j still belongs to point j
+            ideal._separators = [map_back(f, None, center, scale) for f in ideal._separators]
+        ideal.points = pts if backend == "stream" else list(pts)
+        ideal.transform = (center, scale)
+        return ideal
+    if cache is not None:
+        cache = default_cache() if cache is True else cache
+        exact = [tuple(c if type(c) is int else to_fraction(c) for c in p) for p in pts]
+        settings = [("max_degree", max_degree)] + list(options.items())
+        key = point_set_key(exact, len(symbols), backend, order, settings)
+        hit = cache.get(key)
+        if hit is not None:
+            for d, monos, standard, gens, elapsed, skipped in hit:
+                gens = [Generator(lt, terms, symbols, memo) for lt, terms in gens]
+                steps.append(DegreeStep(d, monos, standard, gens, elapsed, skipped))
+            return VanishingIdeal(pts, symbols, backend, steps, order)
+    seps = [] if with_separators and backend == "bm" else None
+    start = time.perf_counter()
+    for d, monos, standard, leads, polys in _steps(pts, max_degree, backend, order, options, seps):
+        if backend in _ARRAY_BACKENDS:
+            polys = [[(m, float(c)) for m, c in zip(monos, row) if c] for row in polys]
+        gens = [Generator(lt, terms, symbols, memo) for lt, terms in zip(leads, polys or [])]
+        now = time.perf_counter()
+        steps.append(DegreeStep(d, monos, standard, gens, now - start, polys is None))
+        start = now
+    if cache is not None:
+        cache.put(key, [(step.degree, step.monos, step.standard,
+                         [(g.lead, g.terms) for g in step.generators], step.elapsed,
+                         step.skipped)
+                        for step in steps])
+    ideal = VanishingIdeal(pts, symbols, backend, steps, order)
+    if seps:
+        ideal._separators = seps
+    return ideal
+
+_default_cache = None
+
+def default_cache():
+    """The shared cache.ResultCache under cache.default_path(), created on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+# ---------------------------------------------------------------------
+# Result objects
+# ---------------------------------------------------------------------
+class Generator:
+    """
+    A vanishing polynomial kept in expanded sparse form.
+
+    `terms` maps exponent tuples to coefficients (Fraction, SymPy Rational
+    or float) and `lead` is the leading exponent.  The SymPy expression and
+    its factorization are presentation views: they are only built when
+    asked for, and cached.
+
+    With a `transform` (center, scale) the given terms are in normalized
+    coordinates (see normalize.py); they are mapped back to the original
+    coordinates the first time `terms` is read, and stay available as
+    `normalized_terms`.
+    """
+
+    def __init__(self, lead, terms, symbols, cache=None, transform=None):
+        self.lead = lead
+        self._terms = dict(terms)
+        self._transform = transform
+        self._normalized = None
+        self.symbols = tuple(symbols)
+        self._cache = {} if cache is None else cache
+        self._expr = None
+        self._factored = None
+
+    def __repr__(self):
+        return f"Generator({to_caret(self.expr)})"
+
+    @property
+    def terms(self):
+        if self._transform is not None:
+            self._normalized = self._terms
+            self._terms = map_back(self._terms, self.lead, *self._transform)
+            self._transform = None
+        return self._terms
+
+    @property
+    def normalized_terms(self):
+        """The terms as computed in normalized coordinates, or None without a transform."""
+        return self._terms if self._transform is not None else self._normalized
+
+    @property
+    def exact(self):
+        return not any(isinstance(c, float) for c in self._terms.values())
+
+    @property
+    def expr(self):
+        """The expanded SymPy expression."""
+        if self._expr is None:
+            self._expr = _to_poly(self.symbols, list(self.terms.items()), self._cache)
+        return self._expr
+
+    @property
+    def factored(self):
+        """The factored SymPy expression (the expanded one for float coefficients)."""
+        if isinstance(self._factored, Future):
+            self._factored = _from_factor_list(self._factored.result())
+        if self._factored is None:
+            self._factored = sp.factor(self.expr) if self.exact else self.expr
+        return self._factored
+
+    def coefficients(self, monos):
+        """Return the coefficients of this generator on the exponents `monos`."""
+        return [self.terms.get(m, 0) for m in monos]
+
+
+def _from_factor_list(result):
+    """
+    Rebuild sp.factor's output from sp.factor_list's.
+
+    Workers return the factor list rather than the factored expression:
+    unpickling a Mul of a rational and a sum distributes the rational and
+    would lose the factored shape.
+    """
+    coeff, factors = result
+    return _keep_coeff(coeff, sp.Mul(*[f ** k for f, k in factors]))
+
+
+# skipped: the exact null-space was not computed (full rank modulo a prime)
+DegreeStep = namedtuple("DegreeStep", "degree monos standard generators elapsed skipped",
+                        defaults=(False,))
+
+class VanishingIdeal:
+    """
+    Result of a single vanishing-ideal computation.
+
+    `steps` holds one DegreeStep per degree: the exponents of the columns
+    of the evaluation matrix, the new standard monomials, the new
+    generators (see :class:`Generator`) and the time spent.  SymPy views
+    (expressions, factorizations, printing and plotting) are only built
+    when asked for; factorizations can be computed ahead of printing in a
+    pool of worker processes with :meth:`factor_all`.
+
+    An exact ideal computed without a `max_degree` cut can be updated in
+    place with :meth:`add_point` and :meth:`remove_point`.
+    """
+
+    def __init__(self, points, symbols, backend, steps, order="grlex"):
+        # streamed point arrays (possibly memory-mapped) are kept as they are
+        self.points = points if backend == "stream" else list(points)
+        self.symbols = tuple(symbols)
+        self.backend = backend
+        self.order = term_order(order)
+        self.steps = steps
+        self.transform = None  # (center, scale) when computed in normalized coordinates
+        self._monos = {}
+        self._exact = None  # (distinct points, standard set, {lead: Generator})
+        self._separators = None
+
+    def __len__(self):
+        return sum(len(step.generators) for step in self.steps)
+
+    @property
+    def degree(self):
+        """Largest degree reached (the regularity degree when the staircase closed)."""
+        return self.steps[-1].degree if self.steps else None
+
+    @property
+    def timings(self):
+        """Seconds spent on each degree."""
+        return {step.degree: step.elapsed for step in self.steps}
+
+    @property
+    def total_time(self):
+        return sum(step.elapsed for step in self.steps)
+
+    @property
+    def skipped_degrees(self):
+        """Degrees whose exact null-space the modular rank check showed to be empty."""
+        return [step.degree for step in self.steps if step.skipped]
+
+    @property
+    def standard_monomials(self):
+        """The standard monomials (staircase), as SymPy monomials."""
+        exps = [m for step in self.steps for m in step.standard]
+        return _monomial_list(self.symbols, exps, self._monos)
+
+    @property
+    def leading_terms(self):
+        """Leading monomials of the generators, as SymPy monomials."""
+        exps = [g.lead for g in self.generators]
+        return _monomial_list(self.symbols, exps, self._monos)
+
+    @property
+    def generators(self):
+        """The generators of the ideal, as :class:`Generator` objects."""
+        return [g for step in self.steps for g in step.generators]
+
+    def by_degree(self):
+        """Yield (degree, monos, polys) like :func:`nullspace_polynomials`."""
+        for step in self.steps:
+            monos = _monomial_list(self.symbols, step.monos, self._monos)
+            if self.backend in _ARRAY_BACKENDS:
+                polys = [np.array(g.coefficients(step.monos)) for g in step.generators]
+            else:
+                polys = [g.expr for g in step.generators]
+            yield step.degree, monos, polys
+
+    def residuals(self, chunk=65536):
+        """
+        Return {degree: [r₁, …, r_k]}, the root-mean-square value at the
+        points of each generator found at that degree, divided by the norm
+        of its coefficient vector.  Both are taken in the coordinates the
+        ideal was computed in (the normalized ones with `normalize`), so
+        for the approximate backend these are the values compared with
+        `eps`; exact generators give zeros up to float rounding.  The
+        points are evaluated `chunk` at a time.
+        """
+        n = len(self.points)
+        center = scale = None
+        if self.transform is not None:
+            center, scale = (np.array(v, dtype=float) for v in self.transform)
+        out = {}
+        for step in self.steps:
+            if not step.generators:
+                continue
+            polys = [g.terms for g in step.generators]
+            if self.transform is not None:
+                # generators from point updates only have exact terms in the
+                # original coordinates; x = c + s·y maps those forward losslessly
+                c, s = self.transform
+                inverse = (tuple(-ci / s for ci in c), 1 / s)
+                polys = [g.normalized_terms if g.normalized_terms is not None
+                         else map_back(g.terms, g.lead, *inverse) for g in step.generators]
+            exps = sorted(set().union(*polys))
+            C = np.array([[float(f.get(e, 0)) for e in exps] for f in polys]).T
+            total = np.zeros(len(polys))
+            for start in range(0, n, chunk):
+                X = point_array(self.points[start:start + chunk])
+                if center is not None:
+                    X = (X - center) / scale
+                total += ((evaluation_matrix(X, exps) @ C) ** 2).sum(axis=0)
+            rms = np.sqrt(total / max(n, 1)) / np.linalg.norm(C, axis=0)
+            out[step.degree] = rms.tolist()
+        return out
+
+    @property
+    def exact_points(self):
+        """The distinct points as tuples of Fractions, in the order of :attr:`separators`."""
+        return list(self._exact_state()[0])
+
+    @property
+    def separators(self):
+        """
+        The separator polynomial of each point of :attr:`exact_points`, as
+        SymPy expressions: it is 1 at that point and 0 at the others, over
+        the standard monomials.
+        """
+        return [_to_poly(self.symbols, list(f.items()), self._monos)
+                for f in self._separator_terms()]
+
+    def _separator_terms(self):
+        pts, _, _ = self._exact_state()
+        if self._separators is None:
+            std = [m for step in self.steps for m in step.standard]
+            self._separators = separators(pts, std)
+        return self._separators
+
+    def interpolation_matrix(self):
+        """
+        Return the object array L of Fractions with one row per standard
+        monomial (in the order of :attr:`standard_monomials`) and one column
+        per point of :attr:`exact_points`, holding the coefficients of that
+        point's separator.  For values v at the points, L @ v gives the
+        coefficients of the unique interpolant over the standard monomials.
+        """
+        std = [m for step in self.steps for m in step.standard]
+        seps = self._separator_terms()
+        L = np.full((len(std), len(seps)), Fraction(0), dtype=object)
+        for j, f in enumerate(seps):
+            for k, e in enumerate(std):
+                if e in f:
+                    L[k, j] = f[e]
+        return L
+
+    def interpolate(self, values):
+        """
+        Return the polynomial over the standard monomials that takes the
+        given values at the points of :attr:`exact_points`, as a SymPy
+        expression.
+        """
+        values = [to_fraction(v) for v in values]
+        L = self.interpolation_matrix()
+        if len(values) != L.shape[1]:
+            raise ValueError(f"expected {L.shape[1]} values, one per distinct point, "
+                             f"got {len(values)}")
+        std = [m for step in self.steps for m in step.standard]
+        coeffs = L @ np.array(values, dtype=object)
+        return _to_poly(self.symbols, [(e, c) for e, c in zip(std, coeffs) if c], self._monos)
+
+    def add_point(self, p):
+        """
+        Add the point `p` and update the ideal from the current basis.
+
+        Only the generators that do not vanish at p change, and p's
+        separator is read off the generator that gives up its leading term
+        (see update.py), so the cost is about O(n·|basis|) rather than a
+        full recomputation.  Adding a point of the set changes nothing.
+        """
+        pts, standard, gens = self._exact_state()
+        q = tuple(to_fraction(c) for c in p)
+        t, changed, separator = insert_point(
+            standard, {lt: g.terms for lt, g in gens.items()}, q, self.order)
+        self.points.append(p)
+        if t is None:
+            return
+        pts.append(q)
+        standard.add(t)
+        del gens[t]
+        for lt, terms in changed.items():
+            gens[lt] = Generator(lt, terms, self.symbols, self._monos)
+        if self._separators is not None:
+            self._separators = update_separators(self._separators, q, separator)
+        self._rebuild_steps()
+
+    def remove_point(self, p):
+        """
+        Remove one occurrence of the point `p` and update the ideal.
+
+        The separator of p joins the ideal and its largest monomial leaves
+        the staircase (see update.py); this needs the separators, which are
+        computed once and then maintained by both updates.  The cost is
+        about O(n·(n + |basis|)).
+        """
+        q = tuple(to_fraction(c) for c in p)
+        index = next((k for k, r in enumerate(self.points)
+                      if tuple(to_fraction(c) for c in r) == q), None)
+        if index is None:
+            raise ValueError(f"{p} is not one of the points")
+        pts, standard, gens = self._exact_state()
+        seps = self._separator_terms()
+        del self.points[index]
+        if any(tuple(to_fraction(c) for c in r) == q for r in self.points):
+            return
+        j = pts.index(q)
+        s, changed, dropped, self._separators = delete_point(
+            {lt: g.terms for lt, g in gens.items()}, seps, j, self.order)
+        del pts[j]
+        standard.discard(s)
+        for lt in dropped:
+            del gens[lt]
+        for lt, terms in changed.items():
+            gens[lt] = Generator(lt, terms, self.symbols, self._monos)
+        self._rebuild_steps()
+
+    def _exact_state(self):
+        """Distinct exact points, standard set and generators by lead, built once."""
+        if self._exact is None:
+            if any(not g.exact for g in self.generators):
+                raise ValueError("point updates need an exact ideal, "
+                                 f"not one from the {self.backend!r} backend")
+            pts = list(dict.fromkeys(tuple(to_fraction(c) for c in p) for p in self.points))
+            standard = {m for step in self.steps for m in step.standard}
+            if len(standard) != len(pts):
+                raise ValueError("point updates need the complete ideal (no max_degree cut)")
+            gens = {}
+            for g in self.generators:
+                if not all(isinstance(c, Fraction) for c in g.terms.values()):
+                    terms = {e: to_fraction(c) for e, c in g.terms.items()}
+                    g = Generator(g.lead, terms, self.symbols, self._monos)
+                gens[g.lead] = g
+            self._exact = (pts, standard, gens)
+        return self._exact
+
+    def _rebuild_steps(self):
+        """Regroup the updated staircase and generators by degree."""
+        _, standard, gens = self._exact
+        elapsed = self.timings
+        ordered = sorted(gens.values(), key=lambda g: self.order.key(g.lead))
+        groups = degree_groups(self.order.sorted(standard),
+                               [(g.lead, list(g.terms.items())) for g in ordered])
+        steps, seen = [], []
+        for d, std_d, gens_d in groups:
+            leads = [lt for lt, _ in gens_d]
+            monos = self.order.sorted(seen + std_d + leads)
+            seen.extend(std_d)
+            steps.append(DegreeStep(d, monos, std_d, [gens[lt] for lt in leads],
+                                    elapsed.get(d, 0.0)))
+        self.steps = steps
+
+    def factor_all(self, workers=None, executor=None):
+        """
+        Factor every generator in worker processes.
+
+        With an `executor`, the jobs are only submitted and this returns at
+        once; each generator picks its result up when its factored form is
+        first read.  Otherwise a pool of `workers` processes is used and the
+        call blocks until all factorizations are done.
+        """
+        pending = [g for g in self.generators if g._factored is None and g.exact]
+        if executor is not None:
+            for g in pending:
+                g._factored = executor.submit(sp.factor_list, g.expr)
+            return
+        if len(pending) < 2:
+            return
+        with ProcessPoolExecutor(workers) as pool:
+            for g, f in zip(pending, pool.map(sp.factor_list, [g.expr for g in pending])):
+                g._factored = _from_factor_list(f)
+
+    def report(self, factor=True, workers=None):
+        """
+        Return the degree-by-degree listing followed by the generators.
+
+        Generators are shown factored unless `factor` is False; with
+        `workers`, the factorizations run in that many processes first.
+        """
+        if factor and workers:
+            self.factor_all(workers)
+        show = (lambda g: g.factored) if factor else (lambda g: g.expr)
+        # float backends also show how far each degree is from vanishing exactly
+        residuals = self.residuals() if self.backend in _ARRAY_BACKENDS else {}
+        lines = ["Vanishing polynomials degree‑by‑degree:", ""]
+        for step in self.steps:
+            if step.generators:
+                monos = _monomial_list(self.symbols, step.monos, self._monos)
+                monos_str = ",".join(to_caret(m) for m in monos)
+                residual = (f"   max residual = {max(residuals[step.degree]):.3g}"
+                            if step.degree in residuals else "")
+                lines.append(f"Degree ≤ {step.degree}   monomials = {{{monos_str}}}   "
+                             f"nullspace dim = {len(step.generators)}{residual}")
+                lines.extend("    " + to_caret(show(g)) for g in step.generators)
+                lines.append("")
+        if self.backend in ("sympy", "domain"):
+            lines.append(f"Exact null-spaces skipped by the rank check mod p: "
+                         f"{len(self.skipped_degrees)} of {len(self.steps)} degrees")
+            lines.append("")
+        lines.append("-" * 60)
+        lines.append("Reduced basis of the vanishing ideal:")
+        lines.extend("    " + to_caret(show(g)) for g in self.generators)
+        return "\n".join(lines)
+
+    def plot(self, ax=None, resolution=400):
+        """Draw the points and the zero curve of every generator (planar ideals only)."""
+        import matplotlib.pyplot as plt
+        from matplotlib.lines import Line2D
+
+        if len(self.symbols) != 2:
+            raise ValueError("plot() needs a planar point set")
+        if ax is None:
+            ax = plt.figure().gca()
+        xs = [float(pt[0]) for pt in self.points]
+        ys = [float(pt[1]) for pt in self.points]
+        handles = [ax.scatter(xs, ys, color='black')]
+        labels = ['Points']
+        # Define plotting grid
+        xx, yy = np.meshgrid(np.linspace(min(xs) - 1, max(xs) + 1, resolution),
+                             np.linspace(min(ys) - 1, max(ys) + 1, resolution))
+        # Draw zero-contour for each generator in the reduced basis
+        for idx, g in enumerate(self.generators, 1):
+            zz = np.broadcast_to(sp.lambdify(self.symbols, g.expr, 'numpy')(xx, yy), xx.shape)
+            ax.contour(xx, yy, zz, levels=[0], colors=[f'C{idx}'], linewidths=2)
+            # Use a proxy line for the contour in the legend
+            handles.append(Line2D([0], [0], color=f'C{idx}', linewidth=2))
+            labels.append(to_caret(g.factored))
+        ax.legend(handles=handles, labels=labels, loc='best')
+        ax.set_title("Reduced basis vanishing curves")
+        ax.set_xlabel(str(self.symbols[0]))
+        ax.set_ylabel(str(self.symbols[1]))
+        return ax
+
+
+class SlidingWindow:
+    """
+    Vanishing ideal of the last `window` points of a stream.
+
+    Each :meth:`push` adds the new point with VanishingIdeal.add_point and
+    lets the oldest one expire with remove_point, so an update costs
+    O(W·(W + |basis|)) for a window of W points and the state (basis and
+    separators) takes O(W·|staircase|) memory; the evaluation matrix is
+    never rebuilt.  Points must be exact (int, Fraction or SymPy numbers;
+    floats are taken at their exact binary value).
+    """
+
+    def __init__(self, symbols, window, order="grlex"):
+        if window < 1:
+            raise ValueError("the window must hold at least one point")
+        self.window = window
+        self._queue = deque()
+        one = (0,) * len(symbols)
+        gens = [Generator(one, {one: Fraction(1)}, symbols)]
+        self.ideal = VanishingIdeal([], symbols, "bm", [DegreeStep(0, [one], [], gens, 0.0)], order)
+        self.ideal._separators = []
+
+    def __len__(self):
+        return len(self._queue)
+
+    @property
+    def points(self):
+        """The points in the window, oldest first."""
+        return list(self._queue)
+
+    def push(self, p):
+        """Add the point `p`, drop the oldest one if the window is full, return the ideal."""
+        self.ideal.add_point(p)
+        self._queue.append(p)
+        if len(self._queue) > self.window:
+            self.ideal.remove_point(self._queue.popleft())
+        return self.ideal
+